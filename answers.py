@@ -0,0 +1,112 @@
+"""
+Persistent store of puzzle answers, so that unchanged puzzles are not solved
+again.
+
+Answers are keyed by day, part, the SHA of the input file and a hash of the
+solver's bytecode: that of the day module and of every module of this repo
+it uses, so editing utils invalidates every day but editing day 12 only day 12.
+"""
+
+import ast
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import sys
+import types
+
+from utils import DATA_FOLDER, input_data_path
+
+STORE_PATH = f"{DATA_FOLDER}/answers.sqlite"
+
+REPO_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+def input_sha(day):
+    with open(input_data_path(day), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def imported_repo_modules(module):
+    """Modules of this repo a module imports anywhere, within functions too."""
+    with open(module.__file__, 'r') as f:
+        tree = ast.parse(f.read())
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+
+        for name in names:
+            if os.path.exists(os.path.join(REPO_FOLDER, f"{name}.py")):
+                yield importlib.import_module(name)
+
+def repo_modules(module):
+    """The module and every module of this repo it uses, directly or not."""
+    found = {}
+    pending = [module]
+    while pending:
+        m = pending.pop()
+        path = getattr(m, "__file__", None)
+        if m.__name__ in found or path is None or os.path.dirname(os.path.abspath(path)) != REPO_FOLDER:
+            continue
+
+        found[m.__name__] = m
+        pending.extend(imported_repo_modules(m))
+        for value in vars(m).values():
+            if isinstance(value, types.ModuleType):
+                pending.append(value)
+            elif getattr(value, "__module__", None) in sys.modules:
+                pending.append(sys.modules[value.__module__])
+
+    return [found[name] for name in sorted(found)]
+
+def _hash_code(code, h):
+    # bytecode, names and constants, but not line numbers
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, h)
+        else:
+            h.update(repr(const).encode())
+
+def solver_sha(module, *extra):
+    """Hash of the bytecode behind a day's solvers, plus anything else they depend on."""
+    h = hashlib.sha256()
+    for m in repo_modules(module):
+        with open(m.__file__, 'r') as f:
+            _hash_code(compile(f.read(), m.__file__, "exec"), h)
+    h.update(repr(extra).encode())
+    return h.hexdigest()
+
+class AnswerStore:
+    def __init__(self, path=STORE_PATH):
+        self.db = sqlite3.connect(path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                day INTEGER, part TEXT, input_sha TEXT, solver_sha TEXT,
+                answer TEXT, seconds REAL,
+                PRIMARY KEY (day, part, input_sha, solver_sha))""")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.db.close()
+
+    def get(self, day, part, input_sha, solver_sha):
+        """(True, answer) if stored for these hashes, else (False, None)."""
+        row = self.db.execute(
+            "SELECT answer FROM answers WHERE day = ? AND part = ? AND input_sha = ? AND solver_sha = ?",
+            (day, part, input_sha, solver_sha)).fetchone()
+        return (True, json.loads(row[0])) if row else (False, None)
+
+    def put(self, day, part, input_sha, solver_sha, answer, seconds):
+        """Store an answer, evicting the ones of older inputs or solvers."""
+        with self.db:
+            self.db.execute("DELETE FROM answers WHERE day = ? AND part = ?", (day, part))
+            self.db.execute("INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?)",
+                            (day, part, input_sha, solver_sha, json.dumps(answer), seconds))
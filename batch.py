@@ -0,0 +1,82 @@
+"""
+Batch mode: solve many inputs of one day, e.g. to grade submitted inputs.
+
+Inputs are spread over worker processes that import the day once and keep
+its warm state between inputs (module tables, day 6's fish counts, ...).
+Results are streamed to stdout as JSON lines, in input order; throughput is
+reported on stderr.
+
+    python batch.py DAY DIRECTORY_OR_GLOB [-w WORKERS] [-p a b]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+
+from runner import PARTS, get_solver
+from utils import read_input_file
+
+# solvers of the day, set up once in each worker
+_SOLVERS = {}
+
+def expand_inputs(spec):
+    """Input files of a directory but its hidden parse caches, or matching a glob pattern, sorted."""
+    if os.path.isdir(spec):
+        paths = [os.path.join(spec, name) for name in os.listdir(spec) if not name.startswith(".")]
+        return sorted(p for p in paths if os.path.isfile(p))
+    return sorted(glob(spec))
+
+def warm_up(day, parts):
+    for part in parts:
+        _SOLVERS[part] = get_solver(day, part)
+
+def solve_input(path):
+    result = {"input": path}
+    start = time.perf_counter()
+    try:
+        data = read_input_file(path)
+        for part, solve in _SOLVERS.items():
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output): # keep stdout for the results
+                answer = solve(data)
+            result[part] = answer if answer is not None else output.getvalue()
+    except Exception as e:
+        result["error"] = repr(e)
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def solve_batch(day, paths, parts=PARTS, workers=None, chunksize=16):
+    """Yield the result of every input, in order, as soon as it is solved."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up,
+                             initargs=(day, parts)) as executor:
+        yield from executor.map(solve_input, paths, chunksize=chunksize)
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many inputs of a day.")
+    parser.add_argument("day", type=int)
+    parser.add_argument("inputs", help="directory of input files, or glob pattern")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: number of cores)")
+    parser.add_argument("-p", "--parts", nargs="+", choices=PARTS, default=list(PARTS))
+    parser.add_argument("--chunksize", type=int, default=16,
+                        help="inputs handed to a worker at once")
+    args = parser.parse_args()
+
+    paths = expand_inputs(args.inputs)
+    start = time.perf_counter()
+    for result in solve_batch(args.day, paths, args.parts, args.workers, args.chunksize):
+        print(json.dumps(result, default=str), flush=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} inputs in {elapsed:.3f}s, {len(paths) / elapsed:.1f} inputs/s",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
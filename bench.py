@@ -0,0 +1,257 @@
+"""
+Benchmark suite: time every solver on seeded synthetic inputs of growing size.
+
+Each day has a generator building an input like the real one, scaled by a
+factor (1x, 10x, 100x by default), so wall time and peak traced memory of
+each part can be compared across the ladder. The exponent column is the
+empirical complexity between two consecutive sizes: log(t2 / t1) / log(s2 / s1).
+
+    python bench.py [-s 1 10 100] [--seed 2021] [-o bench_results.json] [DAY ...]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import random
+import string
+import time
+import tracemalloc
+
+from runner import PARTS, get_solver
+from utils import clear_parse_cache
+
+GENERATORS = {}
+
+# random grids need not ever synchronise, so day 11 part b might never end
+SKIPPED = {(11, "b")}
+
+def generator(day):
+    def register(generate):
+        GENERATORS[day] = generate
+        return generate
+    return register
+
+def grid_text(rows, columns, cell):
+    return "\n".join("".join(str(cell()) for _ in range(columns)) for _ in range(rows))
+
+@generator(1)
+def sonar_depths(rng, scale):
+    depth = 1000
+    depths = []
+    for _ in range(2000 * scale):
+        depth = max(0, depth + rng.randint(-20, 30))
+        depths.append(depth)
+    return "\n".join(map(str, depths))
+
+@generator(2)
+def course_commands(rng, scale):
+    commands = rng.choices(["forward", "down", "up"], weights=[5, 3, 2], k=1000 * scale)
+    return "\n".join(f"{c} {rng.randint(1, 9)}" for c in commands)
+
+@generator(3)
+def diagnostic_report(rng, scale):
+    # every code of the width: day_03's rating filters empty out on a bit all the
+    # codes left share, which sparse reports have (diagnostic.py skips those bits)
+    width = 10 + round(math.log2(scale))
+    codes = list(range(2 ** width))
+    rng.shuffle(codes)
+    return "\n".join(f"{c:0{width}b}" for c in codes)
+
+@generator(4)
+def bingo_boards(rng, scale):
+    numbers = list(range(100))
+    rng.shuffle(numbers)
+
+    boards = []
+    for _ in range(10 * scale):
+        cells = rng.sample(range(100), 25)
+        boards.append("\n".join(" ".join(f"{i:>2}" for i in cells[r * 5:(r + 1) * 5])
+                                for r in range(5)))
+
+    return ",".join(map(str, numbers)) + "\n\n" + "\n\n".join(boards)
+
+@generator(5)
+def vent_lines(rng, scale):
+    segments = []
+    for _ in range(50 * scale):
+        x1, y1 = rng.randrange(1000), rng.randrange(1000)
+        length = rng.randrange(1, 300)
+        dx, dy = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)])
+        x2 = min(999, max(0, x1 + dx * length))
+        y2 = min(999, max(0, y1 + dy * length))
+        if dx and dy: # keep diagonals at 45 degrees after clamping
+            length = min(abs(x2 - x1), abs(y2 - y1))
+            x2, y2 = x1 + dx * length, y1 + dy * length
+        segments.append(f"{x1},{y1} -> {x2},{y2}")
+    return "\n".join(segments)
+
+@generator(6)
+def lanternfish(rng, scale):
+    # part a simulates every fish, so keep the base small
+    return ",".join(str(rng.randint(1, 5)) for _ in range(3 * scale))
+
+@generator(7)
+def crab_positions(rng, scale):
+    return ",".join(str(rng.randrange(2000)) for _ in range(1000 * scale))
+
+DIGIT_SEGMENTS = ["abcefg", "cf", "acdeg", "acdfg", "bcdf", "abdfg", "abdefg", "acf", "abcdefg", "abcdfg"]
+
+@generator(8)
+def seven_segment_notes(rng, scale):
+    notes = []
+    for _ in range(200 * scale):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def pattern(digit):
+            wires = [wiring[s] for s in DIGIT_SEGMENTS[digit]]
+            rng.shuffle(wires)
+            return "".join(wires)
+
+        signals = [pattern(d) for d in rng.sample(range(10), 10)]
+        output = [pattern(rng.randrange(10)) for _ in range(4)]
+        notes.append(" ".join(signals) + " | " + " ".join(output))
+    return "\n".join(notes)
+
+@generator(9)
+def heightmap(rng, scale):
+    n = round(50 * math.sqrt(scale))
+    return grid_text(n, n, lambda: rng.randrange(10))
+
+@generator(10)
+def navigation_lines(rng, scale):
+    closing = {"(": ")", "[": "]", "{": "}", "<": ">"}
+    lines = []
+    for _ in range(100 * scale):
+        stack, line = [], []
+        for _ in range(rng.randint(20, 120)):
+            if stack and rng.random() < 0.45:
+                line.append(closing[stack.pop()])
+            else:
+                stack.append(rng.choice("([{<"))
+                line.append(stack[-1])
+        if stack and rng.random() < 0.5: # corrupted
+            wrong = [c for c in ")]}>" if c != closing[stack[-1]]]
+            line.append(rng.choice(wrong))
+        lines.append("".join(line))
+    return "\n".join(lines)
+
+@generator(11)
+def octopus_energy(rng, scale):
+    n = round(10 * math.sqrt(scale))
+    return grid_text(n, n, lambda: rng.randrange(10))
+
+@generator(12)
+def cave_graph(rng, scale):
+    # paths grow exponentially with the caves, so grow the graph slowly
+    small = rng.sample([a + b for a in string.ascii_lowercase for b in string.ascii_lowercase],
+                       3 + scale.bit_length() * 2 // 3)
+    big = ["A", "B"]
+    edges = {("start", rng.choice(small)), ("start", big[0]), (big[1], "end"), (rng.choice(small), "end")}
+    for cave in small:
+        edges.add((cave, rng.choice(big)))
+        edges.add((cave, rng.choice(small + ["end"])))
+    return "\n".join(f"{a}-{b}" for a, b in sorted(edges) if a != b)
+
+@generator(13)
+def transparent_paper(rng, scale):
+    width, height = round(8 * math.sqrt(scale)), round(6 * math.sqrt(scale))
+    folds = [("x", 2 * width + 1), ("y", 2 * height + 1), ("x", width), ("y", height)]
+    paper_width, paper_height = 4 * width + 3, 4 * height + 3
+
+    dots = set()
+    for _ in range(paper_width * paper_height // 20):
+        x, y = rng.randrange(paper_width), rng.randrange(paper_height)
+        if all((x if axis == "x" else y) != amount for axis, amount in folds):
+            dots.add((x, y))
+
+    return ("\n".join(f"{x},{y}" for x, y in sorted(dots)) + "\n\n"
+            + "\n".join(f"fold along {axis}={amount}" for axis, amount in folds))
+
+@generator(14)
+def polymer_template(rng, scale):
+    elements = "BCFHKNOPSV"
+    template = "".join(rng.choice(elements) for _ in range(20 * scale))
+    rules = [f"{a}{b} -> {rng.choice(elements)}" for a in elements for b in elements]
+    return template + "\n\n" + "\n".join(rules)
+
+@generator(15)
+def chiton_risks(rng, scale):
+    n = round(10 * math.sqrt(scale))
+    return grid_text(n, n, lambda: rng.randint(1, 9))
+
+def run_solver(solve, text):
+    clear_parse_cache()
+    with contextlib.redirect_stdout(io.StringIO()): # day 13 part b prints its answer
+        return solve(text)
+
+def measure(solve, text, memory=True):
+    """Wall seconds of a run with no cached parse and, with memory, peak traced bytes of another."""
+    start = time.perf_counter()
+    run_solver(solve, text)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            run_solver(solve, text)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return seconds, peak
+
+def run_benchmarks(days, scales, seed, memory=True):
+    results = []
+    for day in days:
+        for i, scale in enumerate(scales):
+            text = GENERATORS[day](random.Random(f"{seed}-{day}-{scale}"), scale)
+            for part in PARTS:
+                if (day, part) in SKIPPED:
+                    continue
+
+                if i == 0: # untimed, so imports made within the solver are not timed at the first scale
+                    run_solver(get_solver(day, part), text)
+                seconds, peak = measure(get_solver(day, part), text, memory)
+                results.append({"day": day, "part": part, "scale": scale,
+                                "input_bytes": len(text), "seconds": seconds, "peak_bytes": peak})
+                print_result(results)
+
+    return results
+
+def print_result(results):
+    r = results[-1]
+    previous = [p for p in results[:-1] if (p["day"], p["part"]) == (r["day"], r["part"])]
+
+    exponent = ""
+    if previous and previous[-1]["seconds"] > 0 and r["scale"] != previous[-1]["scale"]:
+        ratio = r["seconds"] / previous[-1]["seconds"]
+        exponent = f"{math.log(ratio) / math.log(r['scale'] / previous[-1]['scale']):.2f}"
+
+    peak = "" if r["peak_bytes"] is None else f"{r['peak_bytes'] / 1024:.0f}"
+    print(f"{r['day']:>3} {r['part']:>4} {r['scale']:>5}x {r['input_bytes']:>10} "
+          f"{r['seconds']:>9.4f} {peak:>10} {exponent:>8}", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the solvers on synthetic inputs.")
+    parser.add_argument("days", nargs="*", type=int, help="days to benchmark (default: all)")
+    parser.add_argument("-s", "--scales", nargs="+", type=int, default=[1, 10, 100],
+                        help="input size factors (default: 1 10 100)")
+    parser.add_argument("--seed", default="2021", help="seed of the input generators")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="results file")
+    args = parser.parse_args()
+
+    days = args.days or sorted(GENERATORS)
+    print(f"{'day':>3} {'part':>4} {'scale':>6} {'bytes':>10} {'seconds':>9} {'peak KiB':>10} {'exponent':>8}")
+    results = run_benchmarks(days, args.scales, args.seed, memory=not args.no_memory)
+
+    with open(args.output, 'w') as f:
+        json.dump({"seed": args.seed, "python": platform.python_version(),
+                   "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
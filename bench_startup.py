@@ -0,0 +1,54 @@
+"""
+Startup benchmark: how long importing each day module takes.
+
+The example checks used to run at import time; they are now only registered
+(see utils.self_test), so their cost is what importing a module saves.
+Every measurement is done in a fresh interpreter.
+
+    python bench_startup.py [-r REPEAT] [DAY ...]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from runner import discover_days
+
+MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import utils
+utils_loaded = time.perf_counter()
+module = __import__(sys.argv[1])
+imported = time.perf_counter()
+utils.run_self_tests(module.__name__)
+checked = time.perf_counter()
+print(json.dumps([imported - utils_loaded, checked - imported]))
+"""
+
+def measure(day, repeat):
+    """Best (import, self-tests) seconds of a day module over some fresh interpreters."""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", MEASURE, f"day_{day:02d}"],
+                             capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(out))
+
+    return min(r[0] for r in runs), min(r[1] for r in runs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure day module import times.")
+    parser.add_argument("days", nargs="*", type=int, help="days to measure (default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="fresh interpreters per module, best one is kept")
+    args = parser.parse_args()
+
+    print(f"{'day':>3} {'import ms':>10} {'checks ms':>10} {'saving':>7}")
+    for day in args.days or discover_days():
+        imported, checked = measure(day, args.repeat)
+        saving = checked / (imported + checked)
+        print(f"{day:>3} {imported * 1000:>10.2f} {checked * 1000:>10.2f} {saving:>7.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Bingo engine (day 4) marking draws through an index rather than board scans.
+
+Every number points to the cells holding it, (board, row, column), and every
+board counts the hits of each of its rows and columns: a draw costs the
+number of cells holding it, and a line wins when its counter reaches N.
+
+Without playing at all: with every cell replaced by the turn its number is
+drawn, a line is complete at the max turn of its cells and a board wins at
+the min of that over its lines, for any number of boards in NumPy at once.
+Board files too large for memory are ranked in batches of boards streamed
+into one buffer, keeping only the first and last winners so far.
+
+    python bingo.py [PATH] [--ranks]
+    python bingo.py [PATH] --stream [--batch BOARDS]
+"""
+
+import argparse
+from collections import defaultdict, deque
+from itertools import islice
+
+import numpy as np
+
+import day_04
+from day_04 import parse_data
+from utils import input_data_path, self_test, run_self_tests
+
+RANK_TABLE_LIMIT = 1 << 24 # largest number looked up in a dense rank table
+
+class BingoGame:
+    def __init__(self, boards):
+        self.boards = boards
+        self.cells = defaultdict(list)
+        for b, board in enumerate(boards):
+            for i, row in enumerate(board.board):
+                for j, number in enumerate(row):
+                    self.cells[number].append((b, i, j))
+
+        self.row_hits = [[0] * board.N for board in boards]
+        self.column_hits = [[0] * board.N for board in boards]
+        self.unmarked = [sum(map(sum, board.board)) for board in boards]
+        self.won = [False] * len(boards)
+        self.drawn = set()
+
+    def draw(self, number):
+        """Mark a number, the boards it makes win for the first time."""
+        if number in self.drawn:
+            return []
+        self.drawn.add(number)
+
+        winners = []
+        for b, i, j in self.cells.get(number, ()):
+            N = self.boards[b].N
+            self.row_hits[b][i] += 1
+            self.column_hits[b][j] += 1
+            self.unmarked[b] -= number
+            if not self.won[b] and (self.row_hits[b][i] == N or self.column_hits[b][j] == N):
+                self.won[b] = True
+                winners.append(b)
+        return winners
+
+    def score(self, board, number):
+        return self.unmarked[board] * number
+
+    def play(self, numbers):
+        """(turn, board, score) of every board, in winning order."""
+        for turn, number in enumerate(numbers):
+            for b in self.draw(number):
+                yield turn, b, self.score(b, number)
+
+def first_winner_score(numbers, boards):
+    return next(BingoGame(boards).play(numbers))[2]
+
+def last_winner_score(numbers, boards):
+    return deque(BingoGame(boards).play(numbers), maxlen=1)[0][2]
+
+@self_test
+def test_bingo_game():
+    numbers, boards = parse_data(day_04.challenge_test_data)
+    assert list(BingoGame(boards).play(numbers)) == [(11, 2, 4512), (13, 0, 2192), (14, 1, 1924)]
+    assert (first_winner_score(numbers, boards), last_winner_score(numbers, boards)) == (4512, 1924)
+
+    # a number drawn again marks nothing
+    game = BingoGame(boards)
+    assert [game.draw(n) for n in (14, 21, 17, 24, 24, 4)] == [[], [], [], [], [], [2]]
+
+def board_cells(boards):
+    """The numbers of day_04 boards as a (boards, N, N) array."""
+    return np.array([board.board for board in boards], dtype=np.int64)
+
+def parse_cells(data):
+    """Draws and (boards, N, N) board numbers of a day 4 input, straight into arrays."""
+    draws, _, boards = data.strip().partition("\n")
+    numbers = np.fromstring(draws, dtype=np.int64, sep=",")
+    N = len(boards.lstrip().partition("\n")[0].split())
+    if N == 0:
+        return numbers, np.zeros((0, 0, 0), dtype=np.int64)
+
+    cells = np.fromstring(boards, dtype=np.int64, sep=" ") # any whitespace
+    if len(cells) % (N * N):
+        raise ValueError(f"boards are not all {N}x{N}")
+    return numbers, cells.reshape(-1, N, N)
+
+def draw_ranks(numbers, cells):
+    """Turn each cell's number is first drawn, len(numbers) if never."""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    never = len(numbers)
+    drawn, first = np.unique(numbers, return_index=True)
+    if len(drawn) == 0 or len(cells) == 0:
+        return np.full(cells.shape, never, dtype=np.int32)
+
+    low, high = min(drawn[0], cells.min()), max(drawn[-1], cells.max())
+    if low >= 0 and high < RANK_TABLE_LIMIT:
+        table = np.full(high + 1, never, dtype=np.int32)
+        table[drawn] = first
+        return table[cells]
+
+    # sparse or negative numbers: look the cells up in the sorted draws
+    at = np.minimum(np.searchsorted(drawn, cells), len(drawn) - 1)
+    return np.where(drawn[at] == cells, first[at], never).astype(np.int32)
+
+def win_turns(ranks):
+    """Turn each board wins at, len(numbers) for boards that never do."""
+    return np.minimum(ranks.max(axis=2).min(axis=1), ranks.max(axis=1).min(axis=1))
+
+def board_scores(numbers, cells, ranks, turns):
+    """Score of each board at the turn it wins, 0 for boards that never do."""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    won = turns < len(numbers)
+    unmarked = np.where(ranks > turns[:, None, None], cells, 0).sum(axis=(1, 2))
+    return np.where(won, unmarked * numbers[np.where(won, turns, 0)], 0)
+
+@self_test
+def test_draw_ranks():
+    numbers, cells = parse_cells(day_04.challenge_test_data)
+    assert cells.shape == (3, 5, 5) and cells[2, 0].tolist() == [14, 21, 17, 24, 4]
+    assert win_turns(draw_ranks(numbers, cells)).tolist() == [13, 14, 11]
+
+    # a number never drawn, sparse and negative numbers through the sorted draws
+    numbers, cells = parse_cells("10,-20,30,10\n\n10 30\n7 -20\n\n7 -20\n-20 7")
+    assert draw_ranks(numbers, cells).tolist() == [[[0, 2], [4, 1]], [[4, 1], [1, 4]]]
+    assert win_turns(draw_ranks(numbers, cells)).tolist() == [2, 4] # the second never wins
+
+class BingoSession:
+    """
+    Every board's winning turn and score, computed once from the draw ranks,
+    then any question on the finishing order is a lookup.
+    """
+    def __init__(self, numbers, cells):
+        self.numbers = np.asarray(numbers, dtype=np.int64)
+        self.cells = cells
+        self.ranks = draw_ranks(self.numbers, cells)
+        self.turns = win_turns(self.ranks)
+        self.scores = board_scores(self.numbers, cells, self.ranks, self.turns)
+
+        won = np.flatnonzero(self.turns < len(self.numbers))
+        self.order = won[np.argsort(self.turns[won], kind="stable")] # boards winning together in board order
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(*parse_cells(data))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def winner(self, k):
+        """(board, turn, score) of the k-th board to win, from 0; -1 is the last."""
+        board = int(self.order[k])
+        return board, int(self.turns[board]), int(self.scores[board])
+
+    def winners_at(self, turn):
+        """Boards winning at a turn."""
+        turns = self.turns[self.order]
+        return self.order[np.searchsorted(turns, turn):np.searchsorted(turns, turn, side="right")]
+
+    def live_after(self, turn):
+        """Boards not won yet once the draw of a turn is marked."""
+        return np.flatnonzero(self.turns > turn)
+
+    def score_at(self, board, turn):
+        """Score of a board if the game stopped at a turn, won or not."""
+        unmarked = self.cells[board][self.ranks[board] > turn].sum()
+        return int(unmarked * self.numbers[turn])
+
+@self_test
+def test_bingo_session():
+    session = BingoSession.from_data(day_04.challenge_test_data)
+    assert [session.winner(k) for k in (0, 1, -1)] == [(2, 11, 4512), (0, 13, 2192), (1, 14, 1924)]
+    assert session.winners_at(11).tolist() == [2] and session.winners_at(12).tolist() == []
+    assert session.live_after(11).tolist() == [0, 1] and session.live_after(14).tolist() == []
+    assert session.score_at(2, 11) == 4512 and session.score_at(1, 14) == 1924
+    assert session.score_at(0, 4) == (300 - 7 - 4 - 9 - 5 - 11) * 11 # not won yet
+
+    # parse_data's draws can be played again
+    numbers, boards = parse_data(day_04.challenge_test_data)
+    assert day_04.challenge_a(numbers, boards) == 4512
+    assert day_04.challenge_b(numbers, parse_data(day_04.challenge_test_data)[1]) == 1924
+
+def ranked_winner_scores(numbers, cells):
+    """Scores of the first and the last board to win."""
+    session = BingoSession(numbers, cells)
+    return session.winner(0)[2], session.winner(-1)[2]
+
+@self_test
+def test_ranked_winner_scores():
+    assert ranked_winner_scores(*parse_cells(day_04.challenge_test_data)) == (4512, 1924)
+
+def board_batches(lines, batch=1 << 14):
+    """
+    The N x N boards of the lines after the draws, N read from the first
+    board, in (boards, N, N) arrays of up to `batch` boards. Every batch is a
+    view of the same buffer, overwritten by the next one.
+    """
+    lines = (line for line in lines if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return
+
+    N = len(first.split())
+    buffer = np.empty((batch, N, N), dtype=np.int64)
+    pending = [first]
+    while True:
+        pending.extend(islice(lines, batch * N - len(pending)))
+        if not pending:
+            return
+
+        values = np.fromstring(" ".join(pending), dtype=np.int64, sep=" ")
+        count = len(pending) // N
+        if len(pending) % N or len(values) != count * N * N:
+            raise ValueError(f"boards are not all {N}x{N}")
+        buffer.reshape(-1)[:len(values)] = values
+        yield buffer[:count]
+        pending = []
+
+def streamed_winners(lines, batch=1 << 14):
+    """(board, turn, score) of the first and the last board to win, in memory bounded by the batch."""
+    lines = iter(lines)
+    numbers = np.array(next(lines).strip().split(","), dtype=np.int64)
+    first = last = None
+    offset = 0
+
+    for cells in board_batches(lines, batch):
+        ranks = draw_ranks(numbers, cells)
+        turns = win_turns(ranks)
+        won = np.flatnonzero(turns < len(numbers))
+        if len(won):
+            candidates = [won[np.argmin(turns[won])], won[len(won) - 1 - np.argmax(turns[won][::-1])]]
+            scores = board_scores(numbers, cells[candidates], ranks[candidates], turns[candidates])
+            (a, b), (score_a, score_b) = candidates, scores
+            if first is None or turns[a] < first[1]:
+                first = (offset + int(a), int(turns[a]), int(score_a))
+            if last is None or turns[b] >= last[1]:
+                last = (offset + int(b), int(turns[b]), int(score_b))
+        offset += len(cells)
+
+    if first is None:
+        raise ValueError("no board wins")
+    return first, last
+
+@self_test
+def test_streamed_winners():
+    lines = day_04.challenge_test_data.strip().split("\n")
+    for batch in (1, 2, 16):
+        assert streamed_winners(lines, batch) == ((2, 11, 4512), (1, 14, 1924))
+
+    # 3x3 boards, the first never winning, the last one incomplete
+    lines = ["5,1,9,2", "", "1 2 3", "4 5 6", "7 8 9", "", "9 5 1", "2 3 4", "6 7 8", "", "1 2 3", "4 5 6"]
+    assert streamed_winners(lines[:10], 1) == ((1, 2, 270), (1, 2, 270))
+    try:
+        streamed_winners(lines, 1)
+        assert False, "incomplete board parsed"
+    except ValueError:
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bingo through a number index.")
+    parser.add_argument("path", nargs="?", default=input_data_path(4), help="draws, then boards")
+    parser.add_argument("--ranks", action="store_true", help="solve from draw ranks, without playing")
+    parser.add_argument("--stream", action="store_true",
+                        help="rank batches of boards read from the file, in bounded memory")
+    parser.add_argument("--batch", type=int, default=1 << 14, help="with --stream, boards per batch")
+    args = parser.parse_args()
+
+    if args.stream:
+        with open(args.path) as f:
+            first, last = streamed_winners(f, args.batch)
+        print(f"part a: {first[2]}")
+        print(f"part b: {last[2]}")
+        return
+
+    with open(args.path) as f:
+        data = f.read()
+
+    if args.ranks:
+        first, last = ranked_winner_scores(*parse_cells(data))
+    else:
+        numbers, boards = parse_data(data)
+        first, last = first_winner_score(numbers, boards), last_winner_score(numbers, boards)
+
+    print(f"part a: {first}")
+    print(f"part b: {last}")
+
+if __name__ == "__main__":
+    run_self_tests(__name__)
+    main()
@@ -0,0 +1,215 @@
+"""
+Course engine (day 2) treating commands as composable moves.
+
+A run of commands moves the submarine's (horizontal, depth, aim) by a Move
+(H, D, A): horizontal + H, depth + D + aim * H, aim + A, where D is the depth
+gained with the aim the run started from set to 0. Running M1 then M2 is
+
+    (H1 + H2, D1 + D2 + A1 * H2, A1 + A2)
+
+which is associative, so a command log can be reduced in any grouping: as
+NumPy prefix scans, pairwise as a tree, or one chunk per worker process.
+Part a reads the aim as its depth, so its answer is H * A; part b's is H * D.
+Scans of courses whose depth could outgrow int64 run on Python ints.
+
+    python course.py [PATH] [-w WORKERS] [--at INDEX ...]
+"""
+
+import argparse
+import os
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import day_02
+from fastparse import chunk_ranges, line_bounds, read_bytes, trailing_ints
+from utils import input_data_path, self_test, run_self_tests
+
+class Move(namedtuple("Move", "horizontal depth aim")):
+    def then(self, other):
+        return Move(self.horizontal + other.horizontal,
+                    self.depth + other.depth + self.aim * other.horizontal,
+                    self.aim + other.aim)
+
+    def apply(self, position):
+        horizontal, depth, aim = position
+        return (horizontal + self.horizontal, depth + self.depth + aim * self.horizontal, aim + self.aim)
+
+STILL = Move(0, 0, 0)
+
+FORWARD, UP, DOWN = b"fud"
+COMMAND_WORDS = (b"forward ", b"up ", b"down ")
+
+def command_move(command, steps):
+    if command == "forward":
+        return Move(steps, 0, 0)
+    elif command == "up":
+        return Move(0, 0, -steps)
+    elif command == "down":
+        return Move(0, 0, steps)
+    else:
+        raise Exception('invalid command')
+
+def compose(moves):
+    """Tree reduction of a sequence of moves, pairing neighbours level by level."""
+    moves = list(moves) or [STILL]
+    while len(moves) > 1:
+        paired = [a.then(b) for a, b in zip(moves[::2], moves[1::2])]
+        moves = paired + moves[len(paired) * 2:]
+    return moves[0]
+
+def command_arrays(commands):
+    """Forward steps and aim change of each (command, steps)."""
+    moves = np.array([command_move(*c) for c in commands], dtype=np.int64).reshape(-1, 3)
+    return moves[:, 0], moves[:, 2]
+
+def parse_columns(buf):
+    """
+    Opcodes (first bytes f, u or d) and amounts of the commands of a byte
+    array, checking every command word in one pass per byte of the words.
+    """
+    starts, ends = line_bounds(buf)
+    opcodes = np.asarray(buf[starts])
+    valid = np.zeros(len(starts), dtype=bool)
+    for word in COMMAND_WORDS:
+        at = np.flatnonzero(opcodes == word[0])
+        matches = ends[at] - starts[at] > len(word) # the word, its space and an amount
+        for k, byte in enumerate(word):
+            matches &= buf[np.where(matches, starts[at] + k, 0)] == byte
+        valid[at] = matches
+
+    if not valid.all():
+        raise Exception('invalid command')
+    return opcodes, trailing_ints(buf, starts, ends)
+
+def column_arrays(opcodes, amounts):
+    """Forward steps and aim change of each command, as masked amounts."""
+    horizontal = np.where(opcodes == FORWARD, amounts, 0)
+    aim = np.where(opcodes == DOWN, amounts, 0) - np.where(opcodes == UP, amounts, 0)
+    return horizontal, aim
+
+@self_test
+def test_parse_columns():
+    text = b"forward 5\r\ndown 5\r\n\r\nforward 8\nup 3\ndown 8\nforward 12"
+    opcodes, amounts = parse_columns(np.frombuffer(text, dtype=np.uint8))
+    assert bytes(opcodes) == b"fdfudf" and amounts.tolist() == [5, 5, 8, 3, 8, 12]
+    assert [h.tolist() for h in column_arrays(opcodes, amounts)] == [[5, 0, 8, 0, 0, 12], [0, 5, 0, -3, 8, 0]]
+
+    for text in (b"forward 1\nback 2\n", b"fly 3", b"dive 2", b"up3", b"downward 1", b"down"):
+        try:
+            parse_columns(np.frombuffer(text, dtype=np.uint8))
+            assert False, "invalid command parsed"
+        except Exception as e:
+            assert str(e) == 'invalid command'
+
+def scan_dtype(horizontal, aim):
+    """int64 if no sum over the course can overflow it (depth is at most sum |aim| * sum |forward|), else object."""
+    bound = (np.abs(horizontal).sum(dtype=np.float64) + 1) * (np.abs(aim).sum(dtype=np.float64) + 1)
+    return np.int64 if bound < 2 ** 62 else object
+
+def arrays_move(horizontal, aim):
+    dtype = scan_dtype(horizontal, aim)
+    horizontal, aim = horizontal.astype(dtype), aim.astype(dtype)
+    aim_before = np.cumsum(aim) - aim
+    return Move(int(horizontal.sum()), int((aim_before * horizontal).sum()), int(aim.sum()))
+
+class Course:
+    """Prefix scans of a command log: the position after any command without replaying."""
+    def __init__(self, horizontal, aim):
+        dtype = scan_dtype(horizontal, aim)
+        horizontal, aim = horizontal.astype(dtype), aim.astype(dtype)
+        aim_after = np.cumsum(aim)
+        self.horizontal = np.concatenate(([0], np.cumsum(horizontal)))
+        self.aim = np.concatenate(([0], aim_after))
+        self.depth = np.concatenate(([0], np.cumsum((aim_after - aim) * horizontal)))
+
+    @classmethod
+    def from_commands(cls, commands):
+        return cls(*command_arrays(commands))
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(*column_arrays(*parse_columns(read_bytes(path))))
+
+    def __len__(self):
+        return len(self.horizontal) - 1
+
+    def position(self, index):
+        """(horizontal, depth, aim) after the first `index` commands."""
+        return int(self.horizontal[index]), int(self.depth[index]), int(self.aim[index])
+
+    def move(self, start=0, stop=None):
+        """The Move of commands[start:stop]."""
+        stop = len(self) if stop is None else stop
+        horizontal = int(self.horizontal[stop] - self.horizontal[start])
+        depth = int(self.depth[stop] - self.depth[start]) - int(self.aim[start]) * horizontal
+        return Move(horizontal, depth, int(self.aim[stop] - self.aim[start]))
+
+EXAMPLE_COMMANDS = [("forward", 5), ("down", 5), ("forward", 8), ("up", 3), ("down", 8), ("forward", 2)]
+
+@self_test
+def test_course():
+    move = compose(command_move(*c) for c in EXAMPLE_COMMANDS)
+    assert (move.horizontal * move.aim, move.horizontal * move.depth) == (150, 900)
+
+    course = Course.from_commands(EXAMPLE_COMMANDS)
+    assert course.move() == move
+    assert course.position(3) == (13, 40, 5)
+    assert course.move(2, 5).apply(course.position(2)) == course.position(5)
+
+    # a depth beyond int64, as day_02 computes it
+    text = "forward 1\ndown 5000000000\nforward 5000000000\nup 1\nforward 3"
+    horizontal, aim = column_arrays(*parse_columns(np.frombuffer(text.encode(), dtype=np.uint8)))
+    move, course = arrays_move(horizontal, aim), Course(horizontal, aim)
+    assert move == course.move() == Move(5000000004, 25000000000000000000 + 3 * 4999999999, 4999999999)
+    assert move.horizontal * move.depth == day_02.solve_challenge_b(text)
+    assert course.position(3) == (5000000001, 25000000000000000000, 5000000000)
+
+def chunk_move(path, start, end):
+    return arrays_move(*column_arrays(*parse_columns(read_bytes(path)[start:end])))
+
+def course_move_parallel(path, workers=None):
+    """Move of a whole command log, one chunk per worker, composed in order."""
+    workers = workers or os.cpu_count()
+    ranges = chunk_ranges(path, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return compose(executor.map(chunk_move, [path] * len(ranges), *zip(*ranges)))
+
+@self_test
+def test_course_move_parallel():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "course.txt")
+        with open(path, 'w') as f:
+            f.write("\n".join(f"{command} {steps}" for command, steps in EXAMPLE_COMMANDS))
+        assert course_move_parallel(path, 4) == Move(15, 60, 10)
+
+        # every chunk beyond int64 on its own
+        with open(path, 'w') as f:
+            f.write("down 5000000000\nforward 5000000000\n" * 4)
+        assert course_move_parallel(path, 4) == Move(20000000000, 250000000000000000000, 20000000000)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a day 2 course as composable moves.")
+    parser.add_argument("path", nargs="?", default=input_data_path(2), help="command log")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="reduce chunks of the log in that many processes")
+    parser.add_argument("--at", nargs="+", type=int, default=[],
+                        help="also print the position after these many commands")
+    args = parser.parse_args()
+
+    if args.workers:
+        move = course_move_parallel(args.path, args.workers)
+    else:
+        course = Course.from_file(args.path)
+        move = course.move()
+        for index in args.at:
+            print(f"after {index} commands: {course.position(index)}")
+
+    print(f"part a: {move.horizontal * move.aim}")
+    print(f"part b: {move.horizontal * move.depth}")
+
+if __name__ == "__main__":
+    run_self_tests(__name__)
+    main()
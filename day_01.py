@@ -61,20 +61,27 @@ measurement.
 How many measurements are larger than the previous measurement?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
-from utils import quantify
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
+from utils import quantify, sliding
 
 def challenge_a(depths):
-    return quantify(zip(depths, depths[1:]), lambda x: x[0] < x[1])
+    return quantify(sliding(depths, 2), lambda x: x[0] < x[1])
 
+def parse_lines(lines):
+    return map(int, lines)
+
+@cached_parse
 def parse_data(data):
-    return [int(i) for i in data.strip().split("\n")]
+    return list(parse_lines(data.strip().split("\n")))
 
 def solve_challenge_a(data):
     data = parse_data(data)
     return challenge_a(data)
 
-assert challenge_a([199, 200, 208, 210, 200, 207, 240, 269, 260, 263]) == 7
+@self_test
+def test_challenge_a():
+    assert challenge_a([199, 200, 208, 210, 200, 207, 240, 269, 260, 263]) == 7
 
 """
 --- Part Two ---
@@ -122,16 +129,19 @@ than the previous sum?
 """
 
 def challenge_b(depths):
-    sliding_window_sums = list(map(sum, zip(depths, depths[1:], depths[2:]))) # sigh
-    return quantify(zip(sliding_window_sums, sliding_window_sums[1:]), lambda x: x[0] < x[1])
+    sliding_window_sums = map(sum, sliding(depths, 3))
+    return challenge_a(sliding_window_sums)
 
 def solve_challenge_b(data):
     data = parse_data(data)
     return challenge_b(data)
 
-assert challenge_b([199, 200, 208, 210, 200, 207, 240, 269, 260, 263]) == 5
+@self_test
+def test_challenge_b():
+    assert challenge_b([199, 200, 208, 210, 200, 207, 240, 269, 260, 263]) == 5
 
 if __name__ == "__main__":
     DAY = 1
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a)
     puzzle_b(DAY, solve_challenge_b)
@@ -38,12 +38,10 @@ the planned course. What do you get if you multiply your final horizontal
 position by your final depth?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
-from utils import quantify
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse, as_str
 
 def challenge_a(commands):
-    horizontal = quantify(commands, lambda x: x[1] if x[0] == "forward" else 0)
-
     def depth_delta(command):
         if command[0] == "forward":
             return 0
@@ -53,13 +51,24 @@ def challenge_a(commands):
             return command[1]
         else:
             raise Exception('invalid command')
-            
-    depth = quantify(commands, depth_delta)
+
+    # single pass, commands may be streamed
+    horizontal, depth = 0, 0
+    for command in commands:
+        horizontal += command[1] if command[0] == "forward" else 0
+        depth += depth_delta(command)
+
     return horizontal * depth
 
+def parse_lines(lines):
+    for line in lines:
+        command, steps = as_str(line).split(" ")
+        yield command, int(steps)
+
+@cached_parse
 def parse_data(data):
     lines = data.strip().split("\n")
-    commands = [(i.split(" ")[0], int(i.split(" ")[1])) for i in lines]
+    commands = list(parse_lines(lines))
     return commands
 
 def solve_challenge_a(data):
@@ -73,7 +82,9 @@ forward 8
 up 3
 down 8
 forward 2"""
-assert solve_challenge_a(challenge_test_data) == 150
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 150
 
 """
 --- Part Two ---
@@ -133,9 +144,12 @@ def solve_challenge_b(data):
     data = parse_data(data)
     return challenge_b(data)
 
-assert solve_challenge_b(challenge_test_data) == 900
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 900
 
 if __name__ == "__main__":
     DAY = 2
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a)
     puzzle_b(DAY, solve_challenge_b)
@@ -49,7 +49,8 @@ and epsilon rate, then multiply them together. What is the power consumption
 of the submarine? (Be sure to represent your answer in decimal, not binary.)
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 from utils import quantify, transpose
 
 def challenge_a(diagnostics):
@@ -63,6 +64,7 @@ def challenge_a(diagnostics):
     epsilon_decimal = int("".join(map(str, epsilon)), 2)
     return gamma_decimal * epsilon_decimal
 
+@cached_parse
 def parse_data(data):
     lines = data.strip().split("\n")
     diagnostics = [map(int, i) for i in lines]
@@ -86,7 +88,9 @@ challenge_test_data = \
 11001
 00010
 01010"""
-assert solve_challenge_a(challenge_test_data) == 198
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 198
 
 """
 --- Part Two ---
@@ -176,9 +180,12 @@ def solve_challenge_b(data):
     data = parse_data(data)
     return challenge_b(data)
 
-assert solve_challenge_b(challenge_test_data) == 230
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 230
 
 if __name__ == "__main__":
     DAY = 3
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 2954600
     puzzle_b(DAY, solve_challenge_b) # 1662846
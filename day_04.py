@@ -74,7 +74,8 @@ To guarantee victory against the giant squid, figure out which board will win
 first. What will your final score be if you choose that board?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 
 class Board:
     def __init__(self, board):
@@ -115,11 +116,12 @@ def challenge_a(numbers, boards):
             if b.game_finished():
                 return b.score()
 
+@cached_parse
 def parse_data(data):
     lines = data.strip().split("\n")
     lines = [i for i in lines if i != ""]
 
-    numbers = map(int, lines[0].split(","))
+    numbers = list(map(int, lines[0].split(",")))
     boards = [lines[i*5+1:(i+1)*5+1] for i in range(len(lines[1:]) // 5)]
     boards = [[tuple(map(int, line.split())) for line in b] for b in boards]
     boards = [Board(b) for b in boards]
@@ -153,7 +155,9 @@ challenge_test_data = \
  2  0 12  3  7
 """
 
-assert solve_challenge_a(challenge_test_data) == 4512
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 4512
 
 """
 --- Part Two ---
@@ -189,9 +193,12 @@ def solve_challenge_b(data):
     numbers, boards = parse_data(data)
     return challenge_b(numbers, boards)
 
-assert solve_challenge_b(challenge_test_data) == 1924
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 1924
 
 if __name__ == "__main__":
     DAY = 4
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 29440
     puzzle_b(DAY, solve_challenge_b) # 13884 
@@ -56,7 +56,8 @@ Consider only horizontal and vertical lines. At how many points do at least
 two lines overlap?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse, as_str
 from collections import defaultdict
 from utils import int_range_incl
 
@@ -84,17 +85,19 @@ def challenge_a(segments):
 
     return result
 
-def parse_data(data):
-    lines = data.strip().split("\n")
-    lines = [i.split(" -> ") for i in lines]
-
+def parse_lines(lines):
     def parse_segment(s):
         a, b = s
         x1, y1 = list(map(int, a.split(",")))
         x2, y2 = list(map(int, b.split(",")))
         return ((x1, y1), (x2, y2))
 
-    segments = [parse_segment(i) for i in lines]
+    return (parse_segment(as_str(i).split(" -> ")) for i in lines)
+
+@cached_parse
+def parse_data(data):
+    lines = data.strip().split("\n")
+    segments = list(parse_lines(lines))
     return segments
 
 def solve_challenge_a(data):
@@ -115,7 +118,9 @@ challenge_test_data = \
 5,5 -> 8,2
 """
 
-assert solve_challenge_a(challenge_test_data) == 5
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 5
 
 """
 --- Part Two ---
@@ -180,9 +185,12 @@ def solve_challenge_b(data):
     segments = parse_data(data)
     return challenge_b(segments)
 
-assert solve_challenge_b(challenge_test_data) == 12
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 12
 
 if __name__ == "__main__":
     DAY = 5
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 7468
     puzzle_b(DAY, solve_challenge_b) # 22364
@@ -69,7 +69,8 @@ would be a total of 5934.
 Find a way to simulate lanternfish. How many lanternfish would there be after 80 days?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 
 def challenge_a(fish, days):
     for _ in range(days):
@@ -79,6 +80,7 @@ def challenge_a(fish, days):
 
     return len(fish)
 
+@cached_parse
 def parse_data(data):
     return [int(i) for i in data.strip().split(",")]
 
@@ -88,8 +90,10 @@ def solve_challenge_a(data, days):
 
 challenge_test_data = [3,4,3,1,2]
 
-assert challenge_a(challenge_test_data, 18) == 26
-assert challenge_a(challenge_test_data, 80) == 5934
+@self_test
+def test_challenge_a():
+    assert challenge_a(challenge_test_data, 18) == 26
+    assert challenge_a(challenge_test_data, 80) == 5934
 
 """
 --- Part Two ---
@@ -121,9 +125,12 @@ def solve_challenge_b(data, days):
     fish = parse_data(data)
     return challenge_b(fish, days)
 
-assert challenge_b(challenge_test_data, 256) == 26984457539 
+@self_test
+def test_challenge_b():
+    assert challenge_b(challenge_test_data, 256) == 26984457539
 
 if __name__ == "__main__":
     DAY = 6
+    run_self_tests(__name__)
     puzzle_a(DAY, lambda data: solve_challenge_a(data, 80)) # 393019 
     puzzle_b(DAY, lambda data: solve_challenge_b(data, 256)) # 1757714216975 
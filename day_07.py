@@ -47,12 +47,14 @@ Determine the horizontal position that the crabs can align to using the least
 fuel possible. How much fuel must they spend to align to that position?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 
 def challenge_a(crabs):
     position = sorted(crabs)[len(crabs) // 2]
     return sum([abs(i - position) for i in crabs])
 
+@cached_parse
 def parse_data(data):
     return [int(i) for i in data.strip().split(",")]
 
@@ -62,7 +64,9 @@ def solve_challenge_a(data):
 
 challenge_test_data = [16,1,2,0,4,2,7,1,2,14]
 
-assert challenge_a(challenge_test_data) == 37
+@self_test
+def test_challenge_a():
+    assert challenge_a(challenge_test_data) == 37
 
 """
 --- Part Two ---
@@ -108,9 +112,12 @@ def solve_challenge_b(data):
     crabs = parse_data(data)
     return challenge_b(crabs)
 
-assert challenge_b(challenge_test_data) == 168
+@self_test
+def test_challenge_b():
+    assert challenge_b(challenge_test_data) == 168
 
 if __name__ == "__main__":
     DAY = 7
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 335330 
     puzzle_b(DAY, solve_challenge_b) # 92439766
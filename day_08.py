@@ -90,12 +90,15 @@ example, there are 26 instances of digits that use a unique number of segments
 In the output values, how many times do digits 1, 4, 7, or 8 appear?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
+import functools
 
 def challenge_a(displays):
     # dirty
     return sum([ sum([1 for k in map(len, j) if k in [2,3,4,7] ]) for i, j in displays])
 
+@cached_parse
 def parse_data(data):
     lines = [line for line in data.strip().split("\n")]
     displays = [i.split(" | ") for i in lines]
@@ -120,7 +123,9 @@ egadfb cdbfeg cegd fecab cgb gbdefca cg fgcdab egfdb bfceg | gbdfcae bgc cg cgb
 gcafb gcf dcaebfg ecagb gf abcdeg gaef cafbge fdbac fegbdc | fgae cfgab fg bagce
 """
 
-assert solve_challenge_a(challenge_test_data) == 26
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 26
 
 """
 --- Part Two ---
@@ -196,18 +201,12 @@ decode_segment = {
     "abcdfg":  9,
 }
 
-def decode_one_segment(display, segment):
-    if len(segment) == 2:
-        return 1
-    if len(segment) == 3:
-        return 7
-    if len(segment) == 4:
-        return 4
-    if len(segment) == 7:
-        return 8
-
+# there are only 7! wirings, so batches of notes keep hitting this cache
+@functools.lru_cache(maxsize=None)
+def wire_context(display):
+    """Wire -> segment mapping of a display, given as its sorted patterns."""
     context = {}
-    
+
     # human prolog stuff
     one = [set(i) for i in display if len(i) == 2][0]
     seven = [set(i) for i in display if len(i) == 3][0]
@@ -243,6 +242,20 @@ def decode_one_segment(display, segment):
     # last letter is g
     context[[i for i in "abcdefg" if i not in context][0]] = 'g'
 
+    return context
+
+def decode_one_segment(display, segment):
+    if len(segment) == 2:
+        return 1
+    if len(segment) == 3:
+        return 7
+    if len(segment) == 4:
+        return 4
+    if len(segment) == 7:
+        return 8
+
+    context = wire_context(tuple(sorted("".join(sorted(i)) for i in display)))
+
     orig = ""
     for s in segment:
         orig += context[s]
@@ -253,16 +266,18 @@ def decode_one_segment(display, segment):
 def decode_line(display, output):
     return int("".join([str(decode_one_segment(display, w)) for w in output]))
 
-assert decode_line(['be', 'cfbegad', 'cbdgef', 'fgaecd', 'cgeb', 'fdcge', 'agebfd', 'fecdb', 'fabcd', 'edb'], ['fdgacbe', 'cefdb', 'cefbgd', 'gcbe']) == 8394
-assert decode_line(['edbfga', 'begcd', 'cbg', 'gc', 'gcadebf', 'fbgde', 'acbgfd', 'abcde', 'gfcbed', 'gfec'], ['fcgedb', 'cgb', 'dgebacf', 'gc']) == 9781
-assert decode_line(['fgaebd', 'cg', 'bdaec', 'gdafb', 'agbcfd', 'gdcbef', 'bgcad', 'gfac', 'gcb', 'cdgabef'], ['cg', 'cg', 'fdcagb', 'cbg']) == 1197
-assert decode_line(['fbegcd', 'cbd', 'adcefb', 'dageb', 'afcb', 'bc', 'aefdc', 'ecdab', 'fgdeca', 'fcdbega'], ['efabcd', 'cedba', 'gadfec', 'cb']) == 9361
-assert decode_line(['aecbfdg', 'fbg', 'gf', 'bafeg', 'dbefa', 'fcge', 'gcbea', 'fcaegb', 'dgceab', 'fcbdga'], ['gecf', 'egdcabf', 'bgf', 'bfgea']) == 4873
-assert decode_line(['fgeab', 'ca', 'afcebg', 'bdacfeg', 'cfaedg', 'gcfdb', 'baec', 'bfadeg', 'bafgc', 'acf'], ['gebdcfa', 'ecba', 'ca', 'fadegcb']) == 8418
-assert decode_line(['dbcfg', 'fgd', 'bdegcaf', 'fgec', 'aegbdf', 'ecdfab', 'fbedc', 'dacgb', 'gdcebf', 'gf'], ['cefg', 'dcbef', 'fcge', 'gbcadfe']) == 4548
-assert decode_line(['bdfegc', 'cbegaf', 'gecbf', 'dfcage', 'bdacg', 'ed', 'bedf', 'ced', 'adcbefg', 'gebcd'], ['ed', 'bcgafe', 'cdgba', 'cbgef']) == 1625
-assert decode_line(['egadfb', 'cdbfeg', 'cegd', 'fecab', 'cgb', 'gbdefca', 'cg', 'fgcdab', 'egfdb', 'bfceg'], ['gbdfcae', 'bgc', 'cg', 'cgb']) == 8717
-assert decode_line(['gcafb', 'gcf', 'dcaebfg', 'ecagb', 'gf', 'abcdeg', 'gaef', 'cafbge', 'fdbac', 'fegbdc'], ['fgae', 'cfgab', 'fg', 'bagce']) == 4315
+@self_test
+def test_decode_line():
+    assert decode_line(['be', 'cfbegad', 'cbdgef', 'fgaecd', 'cgeb', 'fdcge', 'agebfd', 'fecdb', 'fabcd', 'edb'], ['fdgacbe', 'cefdb', 'cefbgd', 'gcbe']) == 8394
+    assert decode_line(['edbfga', 'begcd', 'cbg', 'gc', 'gcadebf', 'fbgde', 'acbgfd', 'abcde', 'gfcbed', 'gfec'], ['fcgedb', 'cgb', 'dgebacf', 'gc']) == 9781
+    assert decode_line(['fgaebd', 'cg', 'bdaec', 'gdafb', 'agbcfd', 'gdcbef', 'bgcad', 'gfac', 'gcb', 'cdgabef'], ['cg', 'cg', 'fdcagb', 'cbg']) == 1197
+    assert decode_line(['fbegcd', 'cbd', 'adcefb', 'dageb', 'afcb', 'bc', 'aefdc', 'ecdab', 'fgdeca', 'fcdbega'], ['efabcd', 'cedba', 'gadfec', 'cb']) == 9361
+    assert decode_line(['aecbfdg', 'fbg', 'gf', 'bafeg', 'dbefa', 'fcge', 'gcbea', 'fcaegb', 'dgceab', 'fcbdga'], ['gecf', 'egdcabf', 'bgf', 'bfgea']) == 4873
+    assert decode_line(['fgeab', 'ca', 'afcebg', 'bdacfeg', 'cfaedg', 'gcfdb', 'baec', 'bfadeg', 'bafgc', 'acf'], ['gebdcfa', 'ecba', 'ca', 'fadegcb']) == 8418
+    assert decode_line(['dbcfg', 'fgd', 'bdegcaf', 'fgec', 'aegbdf', 'ecdfab', 'fbedc', 'dacgb', 'gdcebf', 'gf'], ['cefg', 'dcbef', 'fcge', 'gbcadfe']) == 4548
+    assert decode_line(['bdfegc', 'cbegaf', 'gecbf', 'dfcage', 'bdacg', 'ed', 'bedf', 'ced', 'adcbefg', 'gebcd'], ['ed', 'bcgafe', 'cdgba', 'cbgef']) == 1625
+    assert decode_line(['egadfb', 'cdbfeg', 'cegd', 'fecab', 'cgb', 'gbdefca', 'cg', 'fgcdab', 'egfdb', 'bfceg'], ['gbdfcae', 'bgc', 'cg', 'cgb']) == 8717
+    assert decode_line(['gcafb', 'gcf', 'dcaebfg', 'ecagb', 'gf', 'abcdeg', 'gaef', 'cafbge', 'fdbac', 'fegbdc'], ['fgae', 'cfgab', 'fg', 'bagce']) == 4315
 
 def challenge_b(displays):
     return sum([decode_line(i, j) for i, j in displays])
@@ -271,9 +286,12 @@ def solve_challenge_b(data):
     displays = parse_data(data)
     return challenge_b(displays)
 
-assert solve_challenge_b(challenge_test_data) == 61229
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 61229
 
 if __name__ == "__main__":
     DAY = 8
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 493
     puzzle_b(DAY, solve_challenge_b) # 1010460
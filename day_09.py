@@ -37,33 +37,27 @@ of all low points in the heightmap is therefore 15.
 Find all of the low points on your heightmap. What is the sum of the risk levels of all low points on your heightmap?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 
-def challenge_a(smokes):
-    s = 0
-    lowpoints = []
-
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+# grid (and numpy) are imported by the solvers, keeping this module quick to import
 
-    for i in range(len(smokes)):
-        for j in range(len(smokes[i])):
-            is_lowpoint = True
-
-            for ix, jx in directions:
-                neigh_i, neigh_j = i + ix, j + jx
+def challenge_a(smokes):
+    import numpy as np
+    from grid import Grid
+    grid = Grid(smokes)
 
-                if neigh_i < 0 or neigh_i >= len(smokes) or neigh_j < 0 or neigh_j >= len(smokes[i]):
-                    continue
-                
-                if smokes[neigh_i][neigh_j] <= smokes[i][j]:
-                    is_lowpoint = False
+    # off the map counts as higher than any location
+    is_lowpoint = np.ones(grid.cells.shape, dtype=bool)
+    for neighs in grid.shifted_views(fill=10):
+        is_lowpoint &= neighs > grid.cells
 
-            if is_lowpoint:
-                s += smokes[i][j] + 1
-                lowpoints.append((i, j))
+    s = int((grid.cells[is_lowpoint] + 1).sum())
+    lowpoints = np.flatnonzero(is_lowpoint).tolist() # flat indices
 
     return s, lowpoints
 
+@cached_parse
 def parse_data(data):
     lines = [list(map(int, line)) for line in data.strip().split("\n")]
     return lines
@@ -81,7 +75,9 @@ challenge_test_data = \
 9899965678
 """
 
-assert solve_challenge_a(challenge_test_data) == 15
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 15
 
 """
 Next, you need to find the largest basins so you know what areas are most
@@ -129,30 +125,27 @@ example, this is 9 * 14 * 9 = 1134.
 What do you get if you multiply together the sizes of the three largest basins?
 """
 
-def get_neighs(smokes, i, j):
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    for ix, jx in directions:
-        neigh_i, neigh_j = i + ix, j + jx
+def get_basin(heights, neighs, position, visited):
+    # smoke flows down, so walk up from the low point
+    stack = [position] if heights[position] != 9 else []
+    visited.update(stack)
 
-        if neigh_i < 0 or neigh_i >= len(smokes) or neigh_j < 0 or neigh_j >= len(smokes[i]):
-            continue
-
-        yield neigh_i, neigh_j
-
-def get_basin(smokes, position, visited):
-    i, j = position
-
-    if (i, j) not in visited and smokes[i][j] != 9:
-        visited.add((i, j))
-        for neigh_i, neigh_j in get_neighs(smokes, i, j):
-            if smokes[neigh_i][neigh_j] > smokes[i][j]:
-                get_basin(smokes, (neigh_i, neigh_j), visited)
+    while stack:
+        current = stack.pop()
+        for n in neighs[current]:
+            if n not in visited and heights[n] != 9 and heights[n] > heights[current]:
+                visited.add(n)
+                stack.append(n)
 
     return visited
 
 def challenge_b(smokes):
+    from grid import Grid
     _, lowpoints = challenge_a(smokes)
-    sizes = sorted([get_basin(smokes, i, set()) for i in lowpoints],
+
+    grid = Grid(smokes)
+    heights, neighs = grid.flat.tolist(), grid.neighbour_lists()
+    sizes = sorted([get_basin(heights, neighs, i, set()) for i in lowpoints],
                     key=lambda s: len(s), reverse=True)
 
     result = 1
@@ -165,9 +158,12 @@ def solve_challenge_b(data):
     smokes = parse_data(data)
     return challenge_b(smokes)
 
-assert solve_challenge_b(challenge_test_data) == 1134
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 1134
 
 if __name__ == "__main__":
     DAY = 9
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 502
     puzzle_b(DAY, solve_challenge_b) # 1330560 
@@ -72,7 +72,8 @@ Find the first illegal character in each corrupted line of the navigation
 subsystem. What is the total syntax error score for those errors?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 
 ERROR_POINTS = {
     ')' : 3,
@@ -109,6 +110,7 @@ def challenge_a(data):
 
     return errors_sum
 
+@cached_parse
 def parse_data(data):
     lines = [line for line in data.strip().split("\n")]
     return lines
@@ -131,7 +133,9 @@ challenge_test_data = \
 <{([{{}}[<[[[<>{}]]]>[]]
 """
 
-assert solve_challenge_a(challenge_test_data) == 26397
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 26397
 
 """
 Now, discard the corrupted lines. The remaining lines are incomplete.
@@ -229,9 +233,12 @@ def solve_challenge_b(data):
     data = parse_data(data)
     return challenge_b(data)
 
-assert solve_challenge_b(challenge_test_data) == 288957
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 288957
 
 if __name__ == "__main__":
     DAY = 10
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 216297
     puzzle_b(DAY, solve_challenge_b) # 2165057169
@@ -99,73 +99,41 @@ Given the starting energy levels of the dumbo octopuses in your cavern, simulate
 
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
-
-def get_neighs(m, i, j):
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1), (-1, -1), (-1, 1), (1, 1), (1, -1)]
-    for ix, jx in directions:
-        neigh_i, neigh_j = i + ix, j + jx
-
-        if neigh_i < 0 or neigh_i >= len(m) or neigh_j < 0 or neigh_j >= len(m[i]):
-            continue
-
-        yield neigh_i, neigh_j
-
-class Octopus:
-    def __init__(self, octopuses, position, energy):
-        self.i, self.j = position
-        self.energy = energy
-        self.flashed = False
-        self.octopuses = octopuses
-
-    def tick(self):
-        if self.flashed: return
-        self.energy += 1
-        if self.energy > 9:
-            if not self.flashed:
-                self.flashed = True
-                for a, b in get_neighs(self.octopuses, self.i, self.j):
-                    self.octopuses[a][b].tick()
-                self.energy = 0
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 
-def init_octopuses(data):
-    octopuses = []
-    for i in range(len(data)):
-        octopuses.append([None] * len(data[i]))
-    
-    for i in range(len(data)):
-        for j in range(len(data[i])):
-            octopuses[i][j] = Octopus(octopuses, (i, j), data[i][j])
+# grid (and numpy) are imported by the solvers, keeping this module quick to import
 
-    return octopuses
+def init_octopuses(data):
+    from grid import Grid
+    return Grid(data).cells
 
 def tick_octopuses(octopuses):
-    for i in range(len(octopuses)):
-        for j in range(len(octopuses[i])):
-            octopuses[i][j].tick()
+    """One step on the energy levels, returns which octopuses flashed."""
+    import numpy as np
+    from grid import neighbour_sum
+    octopuses += 1
+    flashed = np.zeros(octopuses.shape, dtype=bool)
+    flashing = octopuses > 9
+
+    while flashing.any():
+        flashed |= flashing
+        octopuses += neighbour_sum(flashing.astype(octopuses.dtype), connectivity=8)
+        flashing = (octopuses > 9) & ~flashed
 
-def reset_flashes(octopuses):
-    for i in range(len(octopuses)):
-        for j in range(len(octopuses[i])):
-            octopuses[i][j].flashed = False
+    octopuses[flashed] = 0
+    return flashed
 
 def challenge_a(data, steps):
     octopuses = init_octopuses(data)
 
     flashes = 0
     for step in range(1, steps+1):
-        tick_octopuses(octopuses)
-
-        # count flashes
-        for i in range(len(octopuses)):
-            for j in range(len(octopuses[i])):
-                if octopuses[i][j].flashed:
-                    flashes += 1
-            
-        reset_flashes(octopuses)
+        flashes += int(tick_octopuses(octopuses).sum())
 
     return flashes
 
+@cached_parse
 def parse_data(data):
     lines = [list(map(int, line)) for line in data.strip().split("\n")]
     return lines
@@ -188,7 +156,9 @@ challenge_test_data = \
 5283751526
 """
 
-assert solve_challenge_a(challenge_test_data, 100) == 1656
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data, 100) == 1656
 
 """
 It seems like the individual flashes aren't bright enough to navigate. However,
@@ -246,27 +216,20 @@ def challenge_b(data):
     while True:
         step += 1
 
-        tick_octopuses(octopuses)
-
         # check sync flashes
-        sync = True
-        for i in range(len(octopuses)):
-            for j in range(len(octopuses[i])):
-                if not octopuses[i][j].flashed:
-                    sync = False
-            
-        if sync:
+        if tick_octopuses(octopuses).all():
             return step
 
-        reset_flashes(octopuses)
-
 def solve_challenge_b(data):
     data = parse_data(data)
     return challenge_b(data)
 
-assert solve_challenge_b(challenge_test_data) == 195
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 195
 
 if __name__ == "__main__":
     DAY = 11
+    run_self_tests(__name__)
     puzzle_a(DAY, lambda x: solve_challenge_a(x, 100)) # 1785 
     puzzle_b(DAY, solve_challenge_b) # 354
@@ -112,7 +112,8 @@ most once?
 
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 from collections import defaultdict
 
 def count_paths(graph, source, visited):
@@ -143,6 +144,7 @@ def challenge_a(data):
 
     return count_paths(graph, "start", set())
 
+@cached_parse
 def parse_data(data):
     lines = [line.split("-") for line in data.strip().split("\n")]
     return lines
@@ -198,9 +200,11 @@ A-end
 b-end
 """
 
-assert solve_challenge_a(challenge_test_data_1) == 19
-assert solve_challenge_a(challenge_test_data_2) == 226
-assert solve_challenge_a(challenge_test_data_3) == 10
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data_1) == 19
+    assert solve_challenge_a(challenge_test_data_2) == 226
+    assert solve_challenge_a(challenge_test_data_3) == 10
 
 """
 --- Part Two ---
@@ -294,11 +298,14 @@ def solve_challenge_b(data):
     data = parse_data(data)
     return challenge_b(data)
 
-assert solve_challenge_b(challenge_test_data_1) == 103
-assert solve_challenge_b(challenge_test_data_2) == 3509
-assert solve_challenge_b(challenge_test_data_3) == 36
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data_1) == 103
+    assert solve_challenge_b(challenge_test_data_2) == 3509
+    assert solve_challenge_b(challenge_test_data_3) == 36
 
 if __name__ == "__main__":
     DAY = 12
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 5756 
     puzzle_b(DAY, solve_challenge_b) # 144603
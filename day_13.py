@@ -130,7 +130,8 @@ How many dots are visible after completing just the first fold instruction on
 your transparent paper?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 from collections import defaultdict
 
 def pprint(paper):
@@ -184,6 +185,7 @@ def challenge_a(dots, folds, nr_folds = 1):
 
     return s, paper
 
+@cached_parse
 def parse_data(data):
     lines = [line for line in data.strip().split("\n") if line != ""]
 
@@ -233,7 +235,9 @@ fold along y=7
 fold along x=5
 """
 
-assert solve_challenge_a(challenge_test_data) == 17
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 17
 
 """
 Finish folding the transparent paper according to the instructions. The manual
@@ -248,5 +252,6 @@ def solve_challenge_b(data):
 
 if __name__ == "__main__":
     DAY = 13
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 850
     puzzle_b(DAY, solve_challenge_b) # AHGCPGAU
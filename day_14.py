@@ -70,7 +70,8 @@ of the most common element and subtract the quantity of the least common
 element?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
 from collections import defaultdict, Counter
 
 def replace(template, rules):
@@ -108,6 +109,7 @@ def challenge_a(template, rules, steps):
     freqs = sorted(count.items(), key=lambda x: x[1])
     return freqs[-1][1] - freqs[0][1]
 
+@cached_parse
 def parse_data(data):
     lines = [line for line in data.strip().split("\n") if line != ""]
     template = lines[0]
@@ -146,10 +148,13 @@ CC -> N
 CN -> C
 """
 
-assert solve_challenge_a(challenge_test_data, 10) == 1588
-assert solve_challenge_a(challenge_test_data, 40) == 2188189693529
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data, 10) == 1588
+    assert solve_challenge_a(challenge_test_data, 40) == 2188189693529
 
 if __name__ == "__main__":
     DAY = 14
+    run_self_tests(__name__)
     puzzle_a(DAY, lambda data: solve_challenge_a(data, 10)) # 3095
     puzzle_b(DAY, lambda data: solve_challenge_a(data, 40)) # 3152788426516
@@ -45,62 +45,44 @@ its risk is not counted).
 What is the lowest total risk of any path from the top left to the bottom right?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
-from collections import defaultdict, namedtuple
-from queue import PriorityQueue
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, run_self_tests
+from utils import cached_parse
+from heapq import heappush, heappop
 
-Edge = namedtuple("Edge", "node distance")
+# grid (and numpy) are imported by the solvers, keeping this module quick to import
 
-def get_neighs(m, i, j):
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    for ix, jx in directions:
-        neigh_i, neigh_j = i + ix, j + jx
-
-        if neigh_i < 0 or neigh_i >= len(m) or neigh_j < 0 or neigh_j >= len(m[i]):
-            continue
-
-        yield neigh_i, neigh_j
-
-def dijkstra(graph, start_vertex):
-    distances = { v:float('inf') for v in graph }
+def dijkstra(risks, neighs, start_vertex):
+    # entering a position costs its risk level
+    distances = [float('inf')] * len(risks)
     distances[start_vertex] = 0
 
-    pq = PriorityQueue()
-    pq.put((0, start_vertex))
-
-    visited = set()
+    pq = [(0, start_vertex)]
 
-    while not pq.empty():
-        (dist, current_vertex) = pq.get()
-        visited.add(current_vertex)
+    while pq:
+        (dist, current_vertex) = heappop(pq)
+        if dist > distances[current_vertex]:
+            continue # stale entry
 
-        for out_edge in graph[current_vertex]:
-            if out_edge.node not in visited:
-                old_cost = distances[out_edge.node]
-                new_cost = distances[current_vertex] + out_edge.distance
-                if new_cost < old_cost:
-                    pq.put((new_cost, out_edge.node))
-                    distances[out_edge.node] = new_cost
+        for n in neighs[current_vertex]:
+            new_cost = dist + risks[n]
+            if new_cost < distances[n]:
+                distances[n] = new_cost
+                heappush(pq, (new_cost, n))
 
     return distances
 
 def challenge_a(data):
-    graph = defaultdict(list)
-
-    # build graph
-    for i, _ in enumerate(data):
-        for j, _ in enumerate(data[i]):
-            neighs = get_neighs(data, i, j)
-            for a, b in neighs:
-                graph[(a,b)].append(Edge((i,j), data[i][j]))
+    from grid import Grid
+    grid = Grid(data)
 
     # find shortest paths
-    start_vertex = (0, 0)
-    min_paths = dijkstra(graph, (0,0))
+    start_vertex = grid.index(0, 0)
+    min_paths = dijkstra(grid.flat.tolist(), grid.neighbour_lists(), start_vertex)
 
-    end_vertex = (len(data) - 1, len(data[-1]) - 1)
+    end_vertex = grid.index(grid.rows - 1, grid.columns - 1)
     return min_paths[end_vertex]
 
+@cached_parse
 def parse_data(data):
     lines = [[int(i) for i in line] for line in data.strip().split("\n")]
     return lines
@@ -123,7 +105,9 @@ challenge_test_data = \
 2311944581
 """
 
-assert solve_challenge_a(challenge_test_data) == 40
+@self_test
+def test_challenge_a():
+    assert solve_challenge_a(challenge_test_data) == 40
 
 """
 --- Part Two ---
@@ -212,31 +196,29 @@ Using the full map, what is the lowest total risk of any path from the top left
 to the bottom right?
 """
 
-def increase_risk(line, k):
-    return [(i + k - 1) % 9 + 1 for i in line]
+def increase_risk(tile, k):
+    return (tile + k - 1) % 9 + 1
 
 def challenge_b(data):
-    # pad lines
-    orig_map_lines = len(data)
-    for i in range(1, 5): # 4 more maps
-        for j in range(orig_map_lines):
-            data.append(increase_risk(data[j], i))
-
-    # pad columns
-    for i in range(len(data)):
-        orig_line = list(data[i])
-        for j in range(1, 5):
-            data[i].extend(increase_risk(orig_line, j))
+    import numpy as np
+    from grid import Grid
 
-    return challenge_a(data)
+    # 5x5 tiles, each one more risky than the one above or left of it
+    tile = Grid(data).cells
+    full_map = np.block([[increase_risk(tile, i + j) for j in range(5)] for i in range(5)])
+
+    return challenge_a(full_map)
 
 def solve_challenge_b(data):
     data = parse_data(data)
     return challenge_b(data)
 
-assert solve_challenge_b(challenge_test_data) == 315
+@self_test
+def test_challenge_b():
+    assert solve_challenge_b(challenge_test_data) == 315
 
 if __name__ == "__main__":
     DAY = 15
+    run_self_tests(__name__)
     puzzle_a(DAY, solve_challenge_a) # 415
     puzzle_b(DAY, solve_challenge_b) # 2864
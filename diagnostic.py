@@ -0,0 +1,280 @@
+"""
+Diagnostic report engine (day 3) on bit-packed codes.
+
+Each code is packed into a row of uint64 words, most significant word first,
+so codes of any width fit and millions of them take 8 bytes per 64 bits.
+Column counts come from shifts and masks over the whole report at once and
+gamma and epsilon straight from bitwise operations on the counts.
+
+The ratings of part b filter codes on their leading bits: once the codes are
+sorted, the ones left after each bit are a range of the sorted codes and the
+split between their 0s and 1s at the next bit is found by binary search. A
+bit that all the codes left share filters nothing, rather than leaving the
+least common value, none of the codes.
+
+Codes of hundreds or thousands of bits are better read by column: BitPlanes
+keeps one bit array over the codes per column, so a column count or a filter
+step is a popcount over n / 64 words whatever the width.
+
+    python diagnostic.py [PATH]
+"""
+
+import argparse
+from bisect import bisect_left
+
+import numpy as np
+
+import day_03
+from fastparse import line_bounds, read_bytes
+from utils import input_data_path, self_test, run_self_tests
+
+WORD = 64
+
+ONE = ord("1")
+
+def word_count(width):
+    return (width + WORD - 1) // WORD
+
+def pack_bits(bits):
+    """Rows of booleans, most significant first, packed into rows of uint64 words."""
+    padding = word_count(bits.shape[1]) * WORD - bits.shape[1]
+    bits = np.pad(bits, ((0, 0), (padding, 0)))
+    return np.packbits(bits, axis=1).view(">u8").astype(np.uint64)
+
+def unpack_bits(words, width):
+    """Rows of uint64 words back into rows of `width` booleans."""
+    bits = np.unpackbits(words.astype(">u8").view(np.uint8), axis=1)
+    return bits[:, bits.shape[1] - width:].astype(bool)
+
+def words_value(words):
+    """The Python int of a row of words."""
+    value = 0
+    for word in words:
+        value = value << WORD | int(word)
+    return value
+
+class Diagnostics:
+    def __init__(self, words, width):
+        self.words = words
+        self.width = width
+
+    @classmethod
+    def from_bytes(cls, buf, batch=1 << 20):
+        """Codes of a byte array of binary lines, packed in batches of about `batch` bits."""
+        starts, ends = line_bounds(buf)
+        width = int(ends[0] - starts[0]) if len(starts) else 0
+        if (ends - starts != width).any():
+            raise ValueError("codes of different widths")
+
+        words = np.zeros((len(starts), word_count(width)), dtype=np.uint64)
+        columns = np.arange(width)
+        rows = max(1, batch // max(width, 1)) # the index of a batch takes 8 bytes a bit
+        for i in range(0, len(starts), rows):
+            words[i:i + rows] = pack_bits(buf[starts[i:i + rows, None] + columns] == ONE)
+        return cls(words, width)
+
+    @classmethod
+    def from_lines(cls, lines, batch=1 << 20):
+        return cls.from_bytes(np.frombuffer("\n".join(lines).encode(), dtype=np.uint8), batch)
+
+    @classmethod
+    def from_file(cls, path):
+        return cls.from_bytes(read_bytes(path))
+
+    def __len__(self):
+        return len(self.words)
+
+    def values(self):
+        """The codes as uint64 up to 64 bits wide, as Python ints past that."""
+        if self.words.shape[1] <= 1:
+            return self.words.reshape(-1)
+        return [words_value(row) for row in self.words]
+
+    def column(self, position):
+        """Bits of the column `position` places from the left, as a uint64 array."""
+        word, shift = divmod(self.width - 1 - position, WORD)
+        return (self.words[:, -1 - word] >> np.uint64(shift)) & np.uint64(1)
+
+    def column_counts(self):
+        """How many codes have a 1 in each column, left to right."""
+        return np.array([int(self.column(p).sum()) for p in range(self.width)], dtype=np.int64)
+
+    def gamma(self):
+        majority = self.column_counts() > len(self) // 2
+        return words_value(pack_bits(majority[None])[0])
+
+    def epsilon(self):
+        return self.gamma() ^ ((1 << self.width) - 1)
+
+    def power_consumption(self):
+        gamma = self.gamma()
+        return gamma * (gamma ^ ((1 << self.width) - 1))
+
+EXAMPLE_CODES = day_03.challenge_test_data.split()
+
+@self_test
+def test_diagnostics():
+    diagnostics = Diagnostics.from_lines(EXAMPLE_CODES)
+    assert (diagnostics.gamma(), diagnostics.epsilon(), diagnostics.power_consumption()) == (22, 9, 198)
+
+    # 100 bits, over two words
+    wide = Diagnostics.from_lines([code * 20 for code in EXAMPLE_CODES])
+    assert wide.values() == [int(code * 20, 2) for code in EXAMPLE_CODES]
+    assert wide.gamma() == int("10110" * 20, 2)
+
+    # wider than a batch, one code per batch
+    codes = [code * 60 for code in EXAMPLE_CODES]
+    assert Diagnostics.from_lines(codes).words.tolist() == Diagnostics.from_lines(codes, batch=256).words.tolist()
+    assert Diagnostics.from_lines(codes, batch=256).values() == [int(code, 2) for code in codes]
+
+class Ratings:
+    """The ratings of part b, from the rating(keep_most_common) of a subclass."""
+    def oxygen(self):
+        return self.rating(True)
+
+    def co2(self):
+        return self.rating(False)
+
+    def life_support(self):
+        return self.oxygen() * self.co2()
+
+class RatingIndex(Ratings):
+    """
+    The codes sorted once, O(n log n), then each rating search costs
+    O(bits log n). Sorted as a uint64 array and split with searchsorted up to
+    64 bits, as a list of Python ints split with bisect past that.
+    """
+    def __init__(self, diagnostics):
+        self.width = diagnostics.width
+        values = diagnostics.values()
+        self.codes = np.sort(values) if isinstance(values, np.ndarray) else sorted(values)
+
+    def split(self, lo, hi, position):
+        """Index of the first code of codes[lo:hi] with a 1 at `position`, as they share the bits before."""
+        bit = 1 << (self.width - 1 - position)
+        first_one = int(self.codes[lo]) & -(bit << 1) | bit
+        if isinstance(self.codes, np.ndarray):
+            return lo + int(np.searchsorted(self.codes[lo:hi], np.uint64(first_one)))
+        return bisect_left(self.codes, first_one, lo, hi)
+
+    def rating(self, keep_most_common):
+        """
+        The code left by the bit criteria, keeping the most or least common
+        bits, ties to 1 or 0; a bit shared by all the codes left keeps them all.
+        """
+        lo, hi = 0, len(self.codes)
+        if lo == hi:
+            raise ValueError("no codes")
+
+        for position in range(self.width):
+            if hi - lo <= 1:
+                break
+            split = self.split(lo, hi, position)
+            ones, zeros = hi - split, split - lo
+            if ones == 0 or zeros == 0:
+                continue
+            if (ones >= zeros) == keep_most_common:
+                lo = split
+            else:
+                hi = split
+        return int(self.codes[lo])
+
+class BitPlanes(Diagnostics, Ratings):
+    """
+    Diagnostics with a bit-plane per column: bit r of planes[c] is the bit of
+    code r at column c. Column counts and rating filters are popcounts of
+    planes under a mask of the codes still in.
+    """
+    def __init__(self, words, width, batch=1 << 16):
+        super().__init__(words, width)
+        self.planes = np.zeros((width, word_count(len(words))), dtype=np.uint64)
+        for i in range(0, len(words), batch): # batch is a multiple of WORD
+            bits = unpack_bits(words[i:i + batch], width).T
+            bits = np.pad(bits, ((0, 0), (0, word_count(bits.shape[1]) * WORD - bits.shape[1])))
+            packed = np.ascontiguousarray(np.packbits(bits, axis=1, bitorder="little")).view("<u8")
+            self.planes[:, i // WORD:i // WORD + packed.shape[1]] = packed
+
+    def all_codes(self):
+        mask = np.zeros(self.planes.shape[1], dtype=np.uint64)
+        full, rest = divmod(len(self), WORD)
+        mask[:full] = ~np.uint64(0)
+        if rest:
+            mask[full] = np.uint64((1 << rest) - 1)
+        return mask
+
+    def column_counts(self):
+        return np.bitwise_count(self.planes).sum(axis=1, dtype=np.int64)
+
+    def rating(self, keep_most_common):
+        """As RatingIndex.rating, narrowing a mask of the codes column by column."""
+        mask = self.all_codes()
+        left = len(self)
+        if left == 0:
+            raise ValueError("no codes")
+
+        for plane in self.planes:
+            if left <= 1:
+                break
+            ones = int(np.bitwise_count(plane & mask).sum())
+            if ones == 0 or ones == left:
+                continue
+            if (ones >= left - ones) == keep_most_common:
+                mask &= plane
+                left = ones
+            else:
+                mask &= ~plane
+                left -= ones
+
+        i = int(np.flatnonzero(mask)[0])
+        row = i * WORD + (int(mask[i]) & -int(mask[i])).bit_length() - 1
+        return words_value(self.words[row])
+
+@self_test
+def test_rating_index():
+    ratings = RatingIndex(Diagnostics.from_lines(EXAMPLE_CODES))
+    assert (ratings.oxygen(), ratings.co2(), ratings.life_support()) == (23, 10, 230)
+
+    # past 64 bits, bisect over Python ints
+    ratings = RatingIndex(Diagnostics.from_lines([code * 20 for code in EXAMPLE_CODES]))
+    assert (ratings.oxygen(), ratings.co2()) == (int("10111" * 20, 2), int("01010" * 20, 2))
+
+@self_test
+def test_bit_planes():
+    planes = BitPlanes(Diagnostics.from_lines(EXAMPLE_CODES).words, 5)
+    assert (planes.power_consumption(), planes.oxygen(), planes.co2()) == (198, 23, 10)
+
+    wide = Diagnostics.from_lines([code * 20 for code in EXAMPLE_CODES])
+    planes = BitPlanes(wide.words, wide.width)
+    assert (planes.oxygen(), planes.co2()) == (int("10111" * 20, 2), int("01010" * 20, 2))
+
+    # more codes than a plane word, built in batches of one word
+    diagnostics = Diagnostics.from_lines([f"{i * 37 % 256:08b}" for i in range(256)])
+    planes = BitPlanes(diagnostics.words, diagnostics.width, batch=WORD)
+    assert planes.column_counts().tolist() == diagnostics.column_counts().tolist()
+    assert planes.life_support() == RatingIndex(diagnostics).life_support()
+
+    # sparse wide codes, the bits all the codes left share filtering nothing
+    codes = ["1" * 70, "1" * 69 + "0", "0" * 70, "0" * 69 + "1"]
+    diagnostics = Diagnostics.from_lines(codes)
+    planes, index = BitPlanes(diagnostics.words, diagnostics.width), RatingIndex(diagnostics)
+    assert (planes.oxygen(), planes.co2()) == (index.oxygen(), index.co2()) == (int(codes[0], 2), int(codes[2], 2))
+
+def main():
+    parser = argparse.ArgumentParser(description="Read a diagnostic report of bit-packed codes.")
+    parser.add_argument("path", nargs="?", default=input_data_path(3), help="binary codes, one per line")
+    args = parser.parse_args()
+
+    diagnostics = Diagnostics.from_file(args.path)
+    print(f"{len(diagnostics)} codes of {diagnostics.width} bits")
+    if diagnostics.width > WORD:
+        diagnostics = BitPlanes(diagnostics.words, diagnostics.width)
+        ratings = diagnostics
+    else:
+        ratings = RatingIndex(diagnostics)
+
+    print(f"part a: {diagnostics.power_consumption()}")
+    print(f"part b: {ratings.life_support()}")
+
+if __name__ == "__main__":
+    run_self_tests(__name__)
+    main()
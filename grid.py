@@ -0,0 +1,67 @@
+"""
+Rectangular grids of numbers (heightmaps, energy levels, risk maps) backed by
+one contiguous NumPy array.
+
+Cells are addressed by flat index, i * columns + j. Neighbourhoods come either
+as precomputed flat-index tables, for the loops of path searches, or as
+shifted views of a padded copy, for whole-grid vectorized updates.
+"""
+
+import numpy as np
+
+OFFSETS_4 = ((-1, 0), (0, 1), (1, 0), (0, -1))
+OFFSETS_8 = OFFSETS_4 + ((-1, -1), (-1, 1), (1, 1), (1, -1))
+
+def offsets(connectivity):
+    if connectivity == 4:
+        return OFFSETS_4
+    if connectivity == 8:
+        return OFFSETS_8
+    raise Exception("connectivity is either 4 or 8")
+
+def shifted_views(cells, fill, connectivity=4):
+    """Views where [i, j] is the (i, j) neighbour of each offset, fill off the grid."""
+    rows, columns = cells.shape
+    padded = np.pad(cells, 1, constant_values=fill)
+    return [padded[1 + di:1 + di + rows, 1 + dj:1 + dj + columns] for di, dj in offsets(connectivity)]
+
+def neighbour_sum(cells, connectivity=4):
+    """Sum of the neighbours of every cell, 0 off the grid."""
+    total = np.zeros_like(cells)
+    for view in shifted_views(cells, 0, connectivity):
+        total += view
+    return total
+
+class Grid:
+    def __init__(self, rows, dtype=np.int64):
+        self.cells = np.array(rows, dtype=dtype)
+        self.rows, self.columns = self.cells.shape
+        self._neighbours = {}
+
+    def __len__(self):
+        return self.cells.size
+
+    @property
+    def flat(self):
+        return self.cells.reshape(-1)
+
+    def index(self, i, j):
+        return i * self.columns + j
+
+    def position(self, index):
+        return divmod(index, self.columns)
+
+    def shifted_views(self, fill, connectivity=4):
+        return shifted_views(self.cells, fill, connectivity)
+
+    def neighbours(self, connectivity=4):
+        """Table of the flat neighbour indices of every cell, -1 off the grid."""
+        if connectivity not in self._neighbours:
+            indices = np.arange(len(self)).reshape(self.cells.shape)
+            views = shifted_views(indices, -1, connectivity)
+            self._neighbours[connectivity] = np.stack(views, axis=-1).reshape(len(self), -1)
+        return self._neighbours[connectivity]
+
+    def neighbour_lists(self, connectivity=4):
+        """Flat neighbour indices of every cell as lists, for plain Python loops."""
+        return [[n for n in row if n >= 0] for row in self.neighbours(connectivity).tolist()]
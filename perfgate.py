@@ -0,0 +1,146 @@
+"""
+Performance regression gate.
+
+Times every solver on its real input and on a generated input larger than
+the real one (see bench.py) over several runs and compares the medians with
+the committed baseline, perf_baseline.json. Exits non-zero when a solver got
+slower than its baseline by more than the tolerance, when a solver of the
+baseline was not timed, or when the baseline was recorded at another scale.
+
+    python perfgate.py [-r 5] [-t 0.25] [-s 1] [DAY ...]
+    python perfgate.py --update          # record a new baseline
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+from bench import GENERATORS, SKIPPED, run_solver
+from runner import PARTS, discover_days, get_solver
+from utils import input_data_path, read_input_file
+
+BASELINE_PATH = "perf_baseline.json"
+
+SEED = "perfgate"
+
+# generator scale at which each day's input outgrows the real one, in bytes;
+# for day 12, in small caves, as its paths grow exponentially with them
+LARGE_SCALES = {1: 1, 2: 1, 3: 2, 4: 16, 5: 16, 6: 128, 7: 1, 8: 1, 9: 8, 10: 2,
+                11: 2, 12: 128, 13: 64, 14: 2, 15: 128}
+
+def median_seconds(solve, text, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_solver(solve, text)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+def inputs_of(day, scale):
+    # not read_input_data: its parses would come from the cache next to the input
+    yield "real", read_input_file(input_data_path(day))
+    if day in GENERATORS:
+        yield "large", GENERATORS[day](random.Random(f"{SEED}-{day}"), LARGE_SCALES[day] * scale)
+
+def time_solvers(days, repeat, scale):
+    """Median seconds of each solver, keyed by day, part and input, e.g. "12b/real"."""
+    timings = {}
+    for day in days:
+        for name, text in inputs_of(day, scale):
+            for part in PARTS:
+                if name != "real" and (day, part) in SKIPPED:
+                    continue
+                timings[f"{day}{part}/{name}"] = median_seconds(get_solver(day, part), text, repeat)
+    return timings
+
+def key_day(key):
+    return int(key.split("/")[0][:-1])
+
+def compare(timings, baseline, tolerance, floor, days):
+    """
+    Rows of (key, baseline, current, change, failed): failed when regressed
+    beyond tolerance and floor, or when a baseline solver of the days was not
+    timed (current None).
+    """
+    rows = []
+    for key, current in timings.items():
+        before = baseline.get(key)
+        if before is None:
+            rows.append((key, None, current, None, False))
+            continue
+
+        change = current / before - 1 if before > 0 else 0.0
+        regressed = change > tolerance and current - before > floor
+        rows.append((key, before, current, change, regressed))
+
+    for key, before in baseline.items():
+        if key not in timings and key_day(key) in days:
+            rows.append((key, before, None, None, True))
+    return rows
+
+def print_table(rows):
+    print(f"{'solver':<12} {'baseline':>10} {'current':>10} {'change':>8}")
+    for key, before, current, change, failed in rows:
+        if current is None:
+            print(f"{key:<12} {before:>10.4f} {'-':>10} {'':>8}  MISSING")
+            continue
+
+        before = "-" if before is None else f"{before:.4f}"
+        change = "new" if change is None else f"{change:+.0%}"
+        print(f"{key:<12} {before:>10} {current:>10.4f} {change:>8}{'  REGRESSED' if failed else ''}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when solvers got slower than the baseline.")
+    parser.add_argument("days", nargs="*", type=int, help="days to check (default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="runs per solver, median is kept")
+    parser.add_argument("-s", "--scale", type=int, default=1,
+                        help="size of the generated inputs, as a multiple of LARGE_SCALES")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.25,
+                        help="allowed slowdown, as a fraction of the baseline")
+    parser.add_argument("--floor", type=float, default=0.002,
+                        help="slowdowns under this many seconds are noise")
+    parser.add_argument("-b", "--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="write the timings as the new baseline")
+    args = parser.parse_args()
+
+    days = args.days or discover_days()
+
+    if args.update:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            baseline = {"scale": args.scale, "timings": {}}
+
+        if baseline["scale"] != args.scale: # the generated timings of other days are stale too
+            print(f"scale {baseline['scale']} -> {args.scale}, dropping the generated input timings",
+                  file=sys.stderr)
+            baseline["timings"] = {k: v for k, v in baseline["timings"].items() if k.endswith("/real")}
+        baseline["scale"] = args.scale
+        baseline["timings"].update(time_solvers(days, args.repeat, args.scale))
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["scale"] != args.scale:
+        sys.exit(f"baseline recorded at scale {baseline['scale']}, not {args.scale}: "
+                 f"use -s {baseline['scale']} or --update")
+
+    rows = compare(time_solvers(days, args.repeat, args.scale), baseline["timings"],
+                   args.tolerance, args.floor, days)
+    print_table(rows)
+
+    failures = [r for r in rows if r[4]]
+    if failures:
+        missing = sum(r[2] is None for r in failures)
+        print(f"{len(failures) - missing} solvers regressed beyond {args.tolerance:.0%}, "
+              f"{missing} missing from the run", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
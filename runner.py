@@ -0,0 +1,162 @@
+"""
+Run the puzzles of every implemented day in one go.
+
+Both parts of each day are independent tasks, so they are fanned out over a
+process pool and the whole run takes roughly as long as the slowest part.
+
+    python runner.py                 # every day, one worker per core
+    python runner.py -w 4 9 11 15    # some days, four workers
+    python runner.py --self-test     # the example checks (days and engines) instead
+    python runner.py --profile 13    # time and memory of each stage, see utils.Stage
+
+Answers are kept in an answer store (see answers.py): a part is only solved
+again when its input or its solver changed.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from glob import glob
+
+from answers import AnswerStore, input_sha, solver_sha
+from utils import solve_puzzle, run_self_tests, PROFILE_ENV, PROFILE_DIR_ENV
+
+PARTS = ("a", "b")
+
+# parts not solved by a plain solve_challenge_{part}(data), as in their __main__
+PUZZLE_OVERRIDES = {
+    (6, "a"): ("solve_challenge_a", 80),
+    (6, "b"): ("solve_challenge_b", 256),
+    (11, "a"): ("solve_challenge_a", 100),
+    (14, "a"): ("solve_challenge_a", 10),
+    (14, "b"): ("solve_challenge_a", 40),
+}
+
+# modules beside the days with example checks of their own, see run_all_self_tests
+ENGINE_MODULES = ("sonar", "course", "diagnostic", "bingo", "vents")
+
+def day_module(day):
+    return importlib.import_module(f"day_{day:02d}")
+
+def discover_days():
+    """Days whose module is implemented (not an empty placeholder)."""
+    paths = sorted(glob("day_[0-9][0-9].py"))
+    return [int(p[4:6]) for p in paths if os.path.getsize(p) > 0]
+
+def get_solver(day, part):
+    """The callable turning the raw input of a day into the answer of a part."""
+    name, *args = PUZZLE_OVERRIDES.get((day, part), (f"solve_challenge_{part}",))
+    solve_challenge = getattr(day_module(day), name)
+    return lambda data: solve_challenge(data, *args)
+
+def run_task(day, part):
+    start = time.perf_counter()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output): # some parts print their answer (day 13's code)
+        answer = solve_puzzle(day, get_solver(day, part), part)
+    if answer is None:
+        answer = output.getvalue()
+    return day, part, answer, time.perf_counter() - start
+
+def run_self_test_task(name):
+    start = time.perf_counter()
+    count = run_self_tests(importlib.import_module(name).__name__)
+    return name, count, time.perf_counter() - start
+
+def task_key(day, part):
+    """Input and solver hashes of a part, as keyed in the answer store."""
+    return input_sha(day), solver_sha(day_module(day), PUZZLE_OVERRIDES.get((day, part)))
+
+def run_all(days, workers=None, store=None):
+    """
+    Solve both parts of the given days, returns sorted (day, part, answer, seconds).
+    With a store, stored answers come back at once with seconds None, and
+    only the other parts are solved (and stored).
+    """
+    results = []
+    pending = {}
+    for day in days:
+        for part in PARTS:
+            key = task_key(day, part) if store is not None else None
+            found, answer = store.get(day, part, *key) if store is not None else (False, None)
+            if found:
+                results.append((day, part, answer, None))
+            else:
+                pending[day, part] = key
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tasks = [executor.submit(run_task, day, part) for day, part in pending]
+            for task in as_completed(tasks):
+                day, part, answer, seconds = task.result()
+                if store is not None:
+                    store.put(day, part, *pending[day, part], answer, seconds)
+                results.append((day, part, answer, seconds))
+
+    return sorted(results, key=lambda r: r[:2])
+
+def run_all_self_tests(names, workers=None):
+    """Run the example checks of the given modules, returns (module, checks, seconds) in order."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_self_test_task, names))
+
+def print_report(results, elapsed):
+    print(f"{'day':>3} {'part':>4} {'seconds':>8}  answer")
+    for day, part, answer, seconds in results:
+        seconds = "stored" if seconds is None else f"{seconds:.3f}"
+        if isinstance(answer, str) and "\n" in answer.strip():
+            answer = "\n" + answer.rstrip("\n")
+        print(f"{day:>3} {part:>4} {seconds:>8}  {answer}")
+
+    solved = [r[3] for r in results if r[3] is not None]
+    print(f"wall time {elapsed:.3f}s, sum of tasks {sum(solved):.3f}s, "
+          f"{len(results) - len(solved)} stored answers")
+
+def print_self_test_report(results, elapsed):
+    print(f"{'module':<10} {'checks':>6} {'seconds':>8}")
+    for name, count, seconds in results:
+        print(f"{name:<10} {count:>6} {seconds:>8.3f}")
+
+    print(f"all {sum(r[1] for r in results)} checks passed in {elapsed:.3f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve all puzzles in parallel.")
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: number of cores)")
+    parser.add_argument("--self-test", action="store_true",
+                        help="run the example checks of each day instead")
+    parser.add_argument("--profile", action="store_true",
+                        help="report time and memory of the read, parse and solve stages")
+    parser.add_argument("--profile-dir", help="also dump a pstats file per day and part here")
+    parser.add_argument("--no-store", action="store_true",
+                        help="solve everything, without reading or writing the answer store")
+    args = parser.parse_args()
+    days = args.days or discover_days()
+
+    # the workers inherit the environment
+    if args.profile:
+        os.environ[PROFILE_ENV] = "1"
+    if args.profile_dir:
+        os.environ[PROFILE_DIR_ENV] = args.profile_dir
+
+    start = time.perf_counter()
+    if args.self_test:
+        # every day and engine, or just the days asked for
+        names = [day_module(day).__name__ for day in days] + ([] if args.days else list(ENGINE_MODULES))
+        results = run_all_self_tests(names, args.workers)
+        print_self_test_report(results, time.perf_counter() - start)
+    elif args.no_store or args.profile or args.profile_dir:
+        results = run_all(days, args.workers)
+        print_report(results, time.perf_counter() - start)
+    else:
+        with AnswerStore() as store:
+            results = run_all(days, args.workers, store)
+        print_report(results, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Sonar sweep engine (day 1) on NumPy arrays, for any window size.
+
+Two consecutive windows of k measurements share k - 1 of them, so the sum of
+the window starting at i + 1 is larger than the one starting at i exactly when
+d[i + k] > d[i]: no window sums are needed. Window 1 is part a, window 3 part b.
+
+    python sonar.py [PATH] [-k 1 3] [-w WORKERS]
+    some_feed | python sonar.py --stream [-k 1 3] [--every N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fastparse import chunk_ranges, parse_ints, read_bytes
+from utils import input_data_path, self_test, run_self_tests
+
+def load_depths(path, dtype=np.int32):
+    return parse_ints(read_bytes(path), dtype)
+
+def count_increases(depths, window=1):
+    """How many sums of `window` consecutive depths are larger than the previous one."""
+    depths = np.asarray(depths)
+    if len(depths) <= window:
+        return 0
+    return int(np.count_nonzero(depths[window:] > depths[:-window]))
+
+EXAMPLE_DEPTHS = [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]
+
+@self_test
+def test_count_increases():
+    assert count_increases(EXAMPLE_DEPTHS) == 7
+    assert count_increases(EXAMPLE_DEPTHS, 3) == 5
+    assert count_increases(EXAMPLE_DEPTHS, 10) == 0
+
+def count_chunk(path, start, end, window):
+    """Increases within a chunk, with its first and last `window` depths for stitching."""
+    depths = parse_ints(read_bytes(path)[start:end], np.int32)
+    return count_increases(depths, window), depths[:window].tolist(), depths[-window:].tolist()
+
+def count_increases_parallel(path, window=1, workers=None):
+    """count_increases of a depths file, counting its chunks in worker processes."""
+    workers = workers or os.cpu_count()
+    ranges = chunk_ranges(path, workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(count_chunk, [path] * len(ranges), *zip(*ranges), [window] * len(ranges))
+
+        # add the comparisons between the last depths before a chunk and its first ones
+        total, tail = 0, []
+        for count, head, last in chunks:
+            seam = tail + head
+            total += count + sum(seam[i + window] > seam[i] for i in range(len(seam) - window)
+                                 if i < len(tail))
+            tail = (seam if len(head) < window else tail + last)[-window:]
+
+    return total
+
+@self_test
+def test_count_increases_parallel():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "depths.txt")
+        with open(path, 'w') as f:
+            f.write("\r\n".join(map(str, EXAMPLE_DEPTHS)))
+        # chunks shorter than the windows, seams spanning several chunks
+        assert [count_increases_parallel(path, window, 4) for window in (1, 3)] == [7, 5]
+
+class SonarCounter:
+    """
+    Running increase counts of an unbounded depth feed, for every window up
+    to max_window at once. Only the last max_window depths are kept.
+    """
+    def __init__(self, max_window=3):
+        self.max_window = max_window
+        self.recent = deque(maxlen=max_window)
+        self.counts = [0] * (max_window + 1)
+        self.depths = 0
+        self.partial_line = b""
+
+    def increases(self, window=1):
+        return self.counts[window]
+
+    def push(self, depth):
+        for window in range(1, len(self.recent) + 1):
+            if depth > self.recent[-window]:
+                self.counts[window] += 1
+
+        self.recent.append(depth)
+        self.depths += 1
+
+    def push_many(self, depths):
+        """Push a chunk of depths, vectorized."""
+        depths = np.asarray(depths, dtype=np.int64)
+        if len(depths) == 0:
+            return
+
+        kept = len(self.recent)
+        joined = np.concatenate((np.array(self.recent, dtype=np.int64), depths))
+        for window in range(1, self.max_window + 1):
+            first = max(window, kept) # comparisons ending on a new depth
+            self.counts[window] += int(np.count_nonzero(joined[first:] > joined[first - window:-window]))
+
+        self.recent.extend(depths[-self.max_window:].tolist())
+        self.depths += len(depths)
+
+    def feed(self, chunk):
+        """Push the depths of a chunk of text bytes, lines may span chunks."""
+        complete, newline, self.partial_line = (self.partial_line + chunk).rpartition(b"\n")
+        if newline:
+            self.push_many(parse_ints(np.frombuffer(complete, dtype=np.uint8)))
+
+    def flush(self):
+        """Push the last line of a feed not ending with a newline."""
+        line, self.partial_line = self.partial_line, b""
+        self.push_many(parse_ints(np.frombuffer(line, dtype=np.uint8)))
+
+    def feed_stream(self, stream, chunk_size=1 << 16):
+        """Consume a binary file-like object (stdin, socket.makefile("rb"), ...) to its end."""
+        while chunk := stream.read(chunk_size):
+            self.feed(chunk)
+            yield self
+        self.flush()
+        yield self
+
+@self_test
+def test_sonar_counter():
+    # chunks cutting lines, no final newline, single pushes in between
+    text = "\n".join(map(str, EXAMPLE_DEPTHS[:8])).encode()
+    counter = SonarCounter(3)
+    for i in range(0, len(text), 4):
+        counter.feed(text[i:i + 4])
+    counter.flush()
+    counter.push(260)
+    counter.push_many([263])
+    assert (counter.depths, counter.increases(1), counter.increases(3)) == (10, 7, 5)
+
+def print_counts(counter, windows):
+    counts = ", ".join(f"window {w}: {counter.increases(w)}" for w in windows)
+    print(f"{counter.depths} depths, {counts}", flush=True)
+
+def stream_main(args):
+    counter = SonarCounter(max(args.windows))
+    reported = 0
+    for _ in counter.feed_stream(sys.stdin.buffer):
+        if args.every and counter.depths >= reported + args.every:
+            reported = counter.depths - counter.depths % args.every
+            print_counts(counter, args.windows)
+
+    print_counts(counter, args.windows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Count depth increases over sliding windows.")
+    parser.add_argument("path", nargs="?", default=input_data_path(1), help="depths, one per line")
+    parser.add_argument("-k", "--windows", nargs="+", type=int, default=[1, 3])
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="count chunks of the file in that many processes")
+    parser.add_argument("--stream", action="store_true", help="count a depth feed from stdin")
+    parser.add_argument("--every", type=int, default=0,
+                        help="with --stream, report the counts every that many depths "
+                             "(checked after each chunk read)")
+    args = parser.parse_args()
+
+    if args.stream:
+        return stream_main(args)
+
+    if args.workers:
+        for window in args.windows:
+            print(f"window {window}: {count_increases_parallel(args.path, window, args.workers)}")
+        return
+
+    depths = load_depths(args.path)
+    for window in args.windows:
+        print(f"window {window}: {count_increases(depths, window)}")
+
+if __name__ == "__main__":
+    run_self_tests(__name__)
+    main()
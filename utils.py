@@ -1,16 +1,196 @@
+import cProfile
+import functools
+import hashlib
+import inspect
+import mmap
+import os
+import pickle
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+from collections import defaultdict
+from itertools import chain, islice, tee
+
 DATA_FOLDER = "./data"
 
-def read_input_data(day: int) -> str:
-    """Read this day's input file."""
+CR = ord("\r")
+
+# example checks of each day module, by module name; see run_self_tests
+SELF_TESTS = defaultdict(list)
+
+def input_data_path(day: int) -> str:
+    """Path of this day's input file."""
     if day < 10:
         day_str = f"0{day}"
     else:
         day_str = f"{day}"
 
-    input_data_path = f"{DATA_FOLDER}/day_{day_str}/input.txt"
-    with open(input_data_path, 'r') as f:
+    return f"{DATA_FOLDER}/day_{day_str}/input.txt"
+
+def read_input_file(path) -> str:
+    """Read any input file, e.g. one of a batch."""
+    with open(path, 'r') as f:
         return f.read()
 
+def read_input_data(day: int) -> str:
+    """Read this day's input file."""
+    path = input_data_path(day)
+    with open(path, 'r') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+
+    _INPUT_FILES[path] = (data, f"{stat.st_mtime_ns}-{stat.st_size}")
+    return data
+
+def iter_input_lines(day: int, raw=False):
+    """
+    Lazily yield the lines of this day's input file, memory-mapped.
+
+    Line-oriented days take them in place of the split input, e.g.
+    day_01.challenge_a(day_01.parse_lines(iter_input_lines(1))) or
+    day_10.challenge_a(iter_input_lines(10)), so memory stays flat whatever
+    the input size. Lines end with LF or CRLF, and blank lines are skipped.
+    With raw, lines are bytes rather than str, leaving the decoding to parsers
+    that need it (int() does not); the parse_lines of days 1, 2 and 5 take
+    either.
+    """
+    with open(input_data_path(day), 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            start = 0
+            while start < len(m):
+                end = m.find(b"\n", start)
+                if end == -1:
+                    end = len(m)
+
+                stop = end - 1 if end > start and m[end - 1] == CR else end
+                if stop > start:
+                    yield m[start:stop] if raw else m[start:stop].decode()
+
+                start = end + 1
+
+#### parsed input cache
+
+# (text, mtime and size) of each input file read by read_input_data and not
+# parsed since, the latest read only
+_INPUT_FILES = {}
+
+# latest (key, encoded parse) of each parser
+_PARSED = {}
+
+def _file_sha(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+@functools.lru_cache()
+def _utils_sha():
+    """SHA of this module's source, so a changed encoding invalidates the cached blobs."""
+    return _file_sha(__file__)
+
+def _is_grid(parsed):
+    return (isinstance(parsed, list) and len(parsed) > 0
+            and all(isinstance(row, list) and len(row) == len(parsed[0]) for row in parsed)
+            and all(type(i) is int for row in parsed for i in row))
+
+def _encode_parsed(parsed):
+    """Grids as a flat int array, anything else pickled."""
+    if _is_grid(parsed):
+        typecode = "b" if all(-128 <= i < 128 for row in parsed for i in row) else "q"
+        flat = array(typecode, chain.from_iterable(parsed))
+        return b"G" + typecode.encode() + struct.pack("<I", len(parsed[0])) + flat.tobytes()
+
+    return b"P" + pickle.dumps(parsed, pickle.HIGHEST_PROTOCOL)
+
+def _decode_parsed(blob):
+    if blob[:1] == b"G":
+        flat = array(blob[1:2].decode())
+        flat.frombytes(blob[6:])
+        columns, = struct.unpack("<I", blob[2:6])
+        return [flat[i:i + columns].tolist() for i in range(0, len(flat), columns)]
+
+    return pickle.loads(blob[1:])
+
+def _read_cache_file(path, key):
+    try:
+        with open(path, 'rb') as f:
+            if f.readline().rstrip(b"\n") == key.encode():
+                return f.read()
+    except FileNotFoundError:
+        pass
+    return None
+
+def _write_cache_file(path, key, blob):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(key.encode() + b"\n" + blob)
+    os.replace(tmp_path, path)
+
+def clear_parse_cache():
+    """Forget the in-memory parses (the files next to the inputs are kept)."""
+    _PARSED.clear()
+
+def cached_parse(parse):
+    """
+    Memoize a day's parse_data on the content of its input.
+
+    Only the text a read_input_data call returned is cached, on its first
+    parse; anything else (batch inputs, examples, generated texts) is parsed
+    as is. Parses are keyed by the input file's mtime and size plus the SHA of
+    the parser's module source and of utils, kept in memory and next to the
+    input as .<parser>.cache. Either is replaced as soon as the input, the
+    source or the encoding changes. Each call decodes a fresh copy, so callers
+    may mutate it. Within a profiled puzzle the cache is bypassed, so the
+    parse stage times parse_data.
+    """
+    @functools.lru_cache()
+    def source_sha():
+        return _file_sha(inspect.getsourcefile(parse))
+
+    def cached(data):
+        # found by identity, neither hashing nor comparing the text
+        input_path = next((path for path, (text, _) in _INPUT_FILES.items() if text is data), None)
+        if input_path is None: # not read by read_input_data, not worth encoding
+            return parse(data)
+        file_key = _INPUT_FILES.pop(input_path)[1]
+
+        key = f"{file_key}-{source_sha()}-{_utils_sha()}"
+        memo_key, blob = _PARSED.get(parse, (None, None))
+        if memo_key == key:
+            return _decode_parsed(blob)
+
+        cache_path = f"{os.path.dirname(input_path)}/.{parse.__name__}.cache"
+        blob = _read_cache_file(cache_path, key)
+
+        try:
+            parsed = _decode_parsed(blob) if blob is not None else None
+        except (AttributeError, ImportError): # pickled by a day run as __main__
+            parsed = None
+
+        if parsed is None:
+            parsed = parse(data)
+            blob = _encode_parsed(parsed)
+            _write_cache_file(cache_path, key, blob)
+
+        _PARSED[parse] = (key, blob)
+        return parsed
+
+    @functools.wraps(parse)
+    def wrapper(data):
+        if _STAGES: # within a profiled puzzle, timing the parse itself rather than a decode
+            with Stage("parse"):
+                return parse(data)
+        return cached(data)
+
+    return wrapper
+
+def as_str(line):
+    """A line read as str or bytes (see iter_input_lines), as str."""
+    return line.decode() if isinstance(line, bytes) else line
+
 def count_from(i):
     while True:
         yield i
@@ -31,17 +211,122 @@ def quantify(iterable, pred=bool):
 
 def transpose(matrix): return tuple(zip(*matrix))
 
+def sliding(iterable, n):
+    "Lazily yield the n-tuples of consecutive items."
+    iterators = tee(iterable, n)
+    return zip(*[islice(it, i, None) for i, it in enumerate(iterators)])
+
 def int_range_incl(a, b):
     return range(a, b + 1) if a < b else range(a, b - 1, -1)
 
 ####
 
-def puzzle_a(day, solve_challenge_a):
+def self_test(test):
+    """Register an example check of its module, without running it."""
+    SELF_TESTS[test.__module__].append(test)
+    return test
+
+def run_self_tests(module=None):
+    """Run the registered example checks of a module (or of every module)."""
+    modules = [module] if module is not None else list(SELF_TESTS)
+    tests = [test for m in modules for test in SELF_TESTS[m]]
+    for test in tests:
+        test()
+    return len(tests)
+
+#### instrumentation, opt-in with AOC_PROFILE=1; AOC_PROFILE_DIR=dir also dumps pstats files
+
+PROFILE_ENV = "AOC_PROFILE"
+PROFILE_DIR_ENV = "AOC_PROFILE_DIR"
+
+# stages being measured, innermost last
+_STAGES = []
+
+class Stage:
+    """
+    Measure a stage of a puzzle: wall and CPU time, peak traced memory above
+    the start of the stage and net blocks, the change in allocated blocks
+    (negative when a stage frees more than it keeps). Reported times leave
+    out nested stages (parse within solve), memory and blocks include them.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.nested = []
+        self.peak = 0
+
+    def __enter__(self):
+        if _STAGES:
+            outer = _STAGES[-1]
+            outer.peak = max(outer.peak, tracemalloc.get_traced_memory()[1])
+            outer.nested.append(self)
+
+        _STAGES.append(self)
+        tracemalloc.reset_peak()
+        self.memory = tracemalloc.get_traced_memory()[0]
+        self.net_blocks = sys.getallocatedblocks()
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+        self.net_blocks = sys.getallocatedblocks() - self.net_blocks
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1]) - self.memory
+        _STAGES.pop()
+
+    def report(self, label, depth=0):
+        own_wall = self.wall - sum(s.wall for s in self.nested)
+        own_cpu = self.cpu - sum(s.cpu for s in self.nested)
+        name = "  " * depth + self.name
+        print(f"{label} {name:<8} wall {own_wall * 1000:>9.2f}ms  cpu {own_cpu * 1000:>9.2f}ms"
+              f"  peak {self.peak / 1024:>9.1f}KiB  net blocks {self.net_blocks:>+8}", file=sys.stderr)
+        for stage in self.nested:
+            stage.report(label, depth + 1)
+
+def profiling():
+    return bool(os.environ.get(PROFILE_ENV) or os.environ.get(PROFILE_DIR_ENV))
+
+def _profiled_puzzle(day, solve_challenge, part):
+    profile_dir = os.environ.get(PROFILE_DIR_ENV)
+    profiler = cProfile.Profile() if profile_dir else None
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+
+    try:
+        with Stage("read") as read:
+            data = read_input_data(day)
+        with Stage("solve") as solve:
+            if profiler is not None:
+                answer = profiler.runcall(solve_challenge, data)
+            else:
+                answer = solve_challenge(data)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    label = f"day {day:>2} {part or ''}"
+    read.report(label)
+    solve.report(label)
+
+    if profiler is not None:
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump_stats(f"{profile_dir}/day_{day:02d}{'_' + part if part else ''}.pstats")
+
+    return answer
+
+def solve_puzzle(day, solve_challenge, part=None):
+    if profiling():
+        return _profiled_puzzle(day, solve_challenge, part)
+
     data = read_input_data(day)
-    print(solve_challenge_a(data))
+    return solve_challenge(data)
+
+def puzzle_a(day, solve_challenge_a):
+    print(solve_puzzle(day, solve_challenge_a, "a"))
 
 
 def puzzle_b(day, solve_challenge_b):
-    data = read_input_data(day)
-    print(solve_challenge_b(data))
+    print(solve_puzzle(day, solve_challenge_b, "b"))
 
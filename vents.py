@@ -0,0 +1,299 @@
+"""
+Vent field engine (day 5) rasterizing segments onto a NumPy canvas.
+
+The canvas spans the bounds of the segments drawn. Every cell a segment
+covers is computed at once for all segments, as the flat index of the canvas,
+and a bincount of those indices is the canvas: the overlaps are the cells
+counted twice or more. Part a draws horizontal and vertical segments, part b
+also the 45 degree ones.
+
+Coordinates in the billions do not fit a canvas: the analytic mode counts on
+the segments instead. Segments are lines of a family (horizontal, vertical,
+or one of the two diagonals), keyed by the line they lie on. Per line, a sweep
+over interval ends gives what one family covers once and twice. Then each
+pair of families is swept for the points covered by both. A point covered
+twice counts once, however many families cover it.
+
+Large fields that still fit a grid can be cut into square tiles instead:
+segments are clipped to the tiles they cross and worker processes rasterize
+one tile at a time on a canvas of the tile's size, summing only the counts.
+
+    python vents.py [PATH] [--analytic]
+    python vents.py [PATH] --tiles SIZE [-w WORKERS]
+"""
+
+import argparse
+import math
+import os
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+
+import day_05
+from day_05 import parse_data
+from utils import input_data_path, int_range_incl, self_test, run_self_tests
+
+def segment_array(segments):
+    """day_05 segments as rows of x1, y1, x2, y2."""
+    return np.array(segments, dtype=np.int64).reshape(-1, 4)
+
+def drawn(segments, diagonals=True):
+    """The segments drawn: horizontal, vertical and, with diagonals, at 45 degrees."""
+    dx = segments[:, 2] - segments[:, 0]
+    dy = segments[:, 3] - segments[:, 1]
+    keep = (dx == 0) | (dy == 0)
+    if diagonals:
+        keep |= np.abs(dx) == np.abs(dy)
+    return segments[keep]
+
+def covered_cells(segments):
+    """x and y of every cell covered by each segment, one row per segment and cell."""
+    x1, y1, x2, y2 = segments.T
+    steps = np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)) + 1
+
+    # position of each cell along its segment
+    owner = np.repeat(np.arange(len(segments)), steps)
+    along = np.arange(len(owner)) - np.repeat(np.cumsum(steps) - steps, steps)
+
+    xs = x1[owner] + along * np.sign(x2 - x1)[owner]
+    ys = y1[owner] + along * np.sign(y2 - y1)[owner]
+    return xs, ys
+
+def overlaps(segments, diagonals=True):
+    """How many cells are covered by at least two of the segments drawn."""
+    segments = drawn(segments, diagonals)
+    if len(segments) == 0:
+        return 0
+
+    xs, ys = covered_cells(segments)
+    x0, y0 = xs.min(), ys.min()
+    width = int(xs.max() - x0) + 1
+    canvas = np.bincount((ys - y0) * width + (xs - x0))
+    return int(np.count_nonzero(canvas >= 2))
+
+@self_test
+def test_overlaps():
+    segments = segment_array(parse_data(day_05.challenge_test_data))
+    assert (overlaps(segments, diagonals=False), overlaps(segments)) == (5, 12)
+
+# family: (key of the line through a point, position of the point along it)
+LINE_KEYS = {
+    "horizontal": lambda x, y: (y, x),
+    "vertical": lambda x, y: (x, y),
+    "diagonal": lambda x, y: (y - x, x),
+    "antidiagonal": lambda x, y: (x + y, x),
+}
+
+LINE_POINTS = {
+    "horizontal": lambda key, t: (t, key),
+    "vertical": lambda key, t: (key, t),
+    "diagonal": lambda key, t: (t, key + t),
+    "antidiagonal": lambda key, t: (t, key - t),
+}
+
+DIAGONALS = ("diagonal", "antidiagonal")
+
+def line_family(x1, y1, x2, y2):
+    if y1 == y2:
+        return "horizontal"
+    elif x1 == x2:
+        return "vertical"
+    elif x2 - x1 == y2 - y1:
+        return "diagonal"
+    elif x2 - x1 == y1 - y2:
+        return "antidiagonal"
+    return None
+
+def add_piece(pieces, lo, hi):
+    if pieces and pieces[-1][1] + 1 == lo:
+        pieces[-1] = (pieces[-1][0], hi)
+    else:
+        pieces.append((lo, hi))
+
+def coverage(intervals):
+    """Sorted disjoint (lo, hi) pieces of a line covered at least once, and at least twice."""
+    events = sorted([(lo, 1) for lo, _ in intervals] + [(hi + 1, -1) for _, hi in intervals])
+    once, twice = [], []
+    covered = 0
+    for (position, delta), (next_position, _) in zip(events, events[1:]):
+        covered += delta
+        if next_position > position:
+            if covered >= 1:
+                add_piece(once, position, next_position - 1)
+            if covered >= 2:
+                add_piece(twice, position, next_position - 1)
+    return once, twice
+
+def sweep_crossings(rows, columns):
+    """
+    (a, b) of every row (b, a_lo, a_hi) crossing a column (a, b_lo, b_hi),
+    rows on different b not overlapping, sweeping a with the rows open by b.
+    """
+    rows = list(rows)
+    events = [(a_lo, 0, b) for b, a_lo, _ in rows] + [(a_hi, 2, b) for b, _, a_hi in rows]
+    events += [(a, 1, (b_lo, b_hi)) for a, b_lo, b_hi in columns]
+    events.sort()
+
+    open_rows = []
+    for a, kind, value in events:
+        if kind == 0:
+            insort(open_rows, value)
+        elif kind == 2:
+            del open_rows[bisect_left(open_rows, value)]
+        else:
+            b_lo, b_hi = value
+            for b in open_rows[bisect_left(open_rows, b_lo):bisect_right(open_rows, b_hi)]:
+                yield a, b
+
+def family_crossings(f, f_pieces, g, g_pieces):
+    """Points covered by a piece of family f and one of family g."""
+    def spans(family, pieces, other):
+        # each piece as (its key, range of the other family's keys along it)
+        key_of = LINE_KEYS[other]
+        for key, line in pieces.items():
+            for lo, hi in line:
+                ends = key_of(*LINE_POINTS[family](key, lo))[0], key_of(*LINE_POINTS[family](key, hi))[0]
+                yield key, min(ends), max(ends)
+
+    for g_key, f_key in sweep_crossings(spans(f, f_pieces, g), spans(g, g_pieces, f)):
+        # the f line meets the g line where g's key, linear along f, reaches g_key
+        start = LINE_KEYS[g](*LINE_POINTS[f](f_key, 0))[0]
+        slope = LINE_KEYS[g](*LINE_POINTS[f](f_key, 1))[0] - start
+        t, off_grid = divmod(g_key - start, slope)
+        if not off_grid:
+            yield LINE_POINTS[f](f_key, t)
+
+def covers(pieces, family, point):
+    key, t = LINE_KEYS[family](*point)
+    line = pieces.get(key, [])
+    i = bisect_right(line, (t, math.inf)) - 1
+    return i >= 0 and line[i][1] >= t
+
+def overlaps_analytic(segments, diagonals=True):
+    """overlaps of day_05 segments, in time depending on segments and crossings, not lengths."""
+    intervals = defaultdict(lambda: defaultdict(list))
+    for (x1, y1), (x2, y2) in segments:
+        family = line_family(x1, y1, x2, y2)
+        if family is None or (family in DIAGONALS and not diagonals):
+            continue
+        (key, t1), (_, t2) = LINE_KEYS[family](x1, y1), LINE_KEYS[family](x2, y2)
+        intervals[family][key].append((min(t1, t2), max(t1, t2)))
+
+    once, twice = defaultdict(dict), defaultdict(dict)
+    for family, lines in intervals.items():
+        for key, line in lines.items():
+            once[family][key], twice[family][key] = coverage(line)
+
+    # points covered twice by one family, plus points shared by families,
+    # the ones both being counted once
+    count = sum(hi - lo + 1 for lines in twice.values() for line in lines.values() for lo, hi in line)
+    shared = set()
+    for f, g in combinations(once, 2):
+        shared.update(family_crossings(f, once[f], g, once[g]))
+    for point in shared:
+        count += 1 - sum(covers(twice[f], f, point) for f in twice)
+
+    return count
+
+# crossings of 2 to 5 lines, collinear overlaps, diagonals crossing off the grid,
+# a single point and a segment that is neither straight nor at 45 degrees
+NEGATIVE_TEST_DATA = """
+-3,-3 -> 3,3
+-3,3 -> 3,-3
+-2,-3 -> 2,1
+0,-5 -> 0,5
+-5,0 -> 5,0
+-1,-1 -> 1,1
+4,-4 -> 2,-2
+2,2 -> 2,2
+-5,-2 -> -1,-2
+-4,-4 -> -4,1
+1,2 -> 4,6
+"""
+
+@self_test
+def test_overlaps_analytic():
+    segments = parse_data(day_05.challenge_test_data)
+    assert (overlaps_analytic(segments, diagonals=False), overlaps_analytic(segments)) == (5, 12)
+
+    segments = parse_data(NEGATIVE_TEST_DATA)
+    assert overlaps_analytic(segments, diagonals=False) == day_05.challenge_a(segments)
+    assert overlaps_analytic(segments) == day_05.challenge_b(segments)
+
+def tile_pieces(segment, size):
+    """The pieces of a segment within each square tile it crosses, as (tile, piece)."""
+    (x1, y1), (x2, y2) = segment
+    sx, sy = (x2 > x1) - (x2 < x1), (y2 > y1) - (y2 < y1)
+    steps = max(abs(x2 - x1), abs(y2 - y1))
+
+    # steps entering a new tile column or row
+    cuts = {0, steps + 1}
+    for start, end, step in ((x1, x2, sx), (y1, y2, sy)):
+        for tile in int_range_incl(start // size, end // size)[1:]:
+            edge = tile * size if step > 0 else tile * size + size - 1
+            cuts.add((edge - start) * step)
+
+    cuts = sorted(cuts)
+    for lo, hi in zip(cuts, cuts[1:]):
+        a, b = (x1 + sx * lo, y1 + sy * lo), (x1 + sx * (hi - 1), y1 + sy * (hi - 1))
+        yield (a[0] // size, a[1] // size), (a, b)
+
+def tile_overlaps(tile, pieces, size):
+    """Cells covered twice or more within a tile, on a canvas of the tile only."""
+    xs, ys = covered_cells(segment_array(pieces))
+    canvas = np.bincount((ys - tile[1] * size) * size + (xs - tile[0] * size), minlength=size * size)
+    return int(np.count_nonzero(canvas >= 2))
+
+def overlaps_tiled(segments, diagonals=True, size=256, workers=None):
+    """overlaps of day_05 segments, rasterizing tiles of size x size cells in worker processes."""
+    tiles = defaultdict(list)
+    for segment in segments:
+        family = line_family(*segment[0], *segment[1])
+        if family is None or (family in DIAGONALS and not diagonals):
+            continue
+        for tile, piece in tile_pieces(segment, size):
+            tiles[tile].append(piece)
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        counts = executor.map(tile_overlaps, list(tiles), list(tiles.values()), [size] * len(tiles),
+                              chunksize=max(1, len(tiles) // (workers * 4)))
+        return sum(counts)
+
+@self_test
+def test_overlaps_tiled():
+    segments = parse_data(day_05.challenge_test_data)
+    assert (overlaps_tiled(segments, False, 4, 2), overlaps_tiled(segments, True, 4, 2)) == (5, 12)
+
+    # tiles of 3 cells cut every segment, negative tiles included
+    segments = parse_data(NEGATIVE_TEST_DATA)
+    assert overlaps_tiled(segments, True, 3, 2) == day_05.challenge_b(segments)
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the points where vent lines overlap.")
+    parser.add_argument("path", nargs="?", default=input_data_path(5), help="segments, x1,y1 -> x2,y2")
+    parser.add_argument("--analytic", action="store_true",
+                        help="count on the segments rather than a raster, for huge coordinates")
+    parser.add_argument("--tiles", type=int, default=0,
+                        help="rasterize tiles of that many cells square in worker processes")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="with --tiles, worker processes")
+    args = parser.parse_args()
+
+    with open(args.path) as f:
+        segments = parse_data(f.read())
+
+    if args.analytic:
+        count = overlaps_analytic
+    elif args.tiles:
+        count = lambda segments, diagonals=True: overlaps_tiled(segments, diagonals, args.tiles, args.workers)
+    else:
+        count = lambda segments, diagonals=True: overlaps(segment_array(segments), diagonals)
+    print(f"part a: {count(segments, diagonals=False)}")
+    print(f"part b: {count(segments)}")
+
+if __name__ == "__main__":
+    run_self_tests(__name__)
+    main()